@@ -0,0 +1,290 @@
+from typing import Dict, List, Optional
+from .memory import HeapSimulator
+
+class HeapAnalyzer:
+    """Heap graph analytics: SCCs, dominator tree and retained sizes.
+    
+    Results are cached against ``HeapSimulator.version`` and recomputed only
+    after the heap has changed. All traversals are iterative so deep object
+    chains do not hit Python's recursion limit.
+    """
+    
+    def __init__(self, heap: HeapSimulator):
+        self.heap = heap
+        self._version = None
+        self._cache: Dict = {}
+    
+    def _ensure_fresh(self):
+        """Drop cached results if the heap changed since they were computed"""
+        if self._version != self.heap.version:
+            self._cache = {}
+            self._version = self.heap.version
+    
+    def _graph(self) -> Dict:
+        """Index the heap as integer adjacency lists, ignoring dangling references"""
+        self._ensure_fresh()
+        if 'graph' not in self._cache:
+            ids = list(self.heap.blocks.keys())
+            index = {block_id: i for i, block_id in enumerate(ids)}
+            successors = [
+                [index[ref] for ref in self.heap.blocks[block_id].references if ref in index]
+                for block_id in ids
+            ]
+            sizes = [self.heap.blocks[block_id].size * self.heap.block_size for block_id in ids]
+            roots = [index[root_id] for root_id in self.heap.roots if root_id in index]
+            self._cache['graph'] = {
+                'ids': ids,
+                'index': index,
+                'successors': successors,
+                'sizes': sizes,
+                'roots': roots
+            }
+        return self._cache['graph']
+    
+    def strongly_connected_components(self) -> Dict:
+        """Tarjan's algorithm, iteratively; returns components and each node's component"""
+        self._ensure_fresh()
+        if 'scc' in self._cache:
+            return self._cache['scc']
+        
+        graph = self._graph()
+        successors = graph['successors']
+        n = len(successors)
+        order = [-1] * n      # Discovery index
+        low = [0] * n
+        on_stack = [False] * n
+        component_of = [-1] * n
+        stack: List[int] = []
+        components: List[List[int]] = []
+        counter = 0
+        
+        for start in range(n):
+            if order[start] != -1:
+                continue
+            work = [(start, 0)]
+            while work:
+                node, edge = work.pop()
+                if edge == 0:
+                    order[node] = low[node] = counter
+                    counter += 1
+                    stack.append(node)
+                    on_stack[node] = True
+                
+                recurse = False
+                edges = successors[node]
+                while edge < len(edges):
+                    succ = edges[edge]
+                    edge += 1
+                    if order[succ] == -1:
+                        work.append((node, edge))
+                        work.append((succ, 0))
+                        recurse = True
+                        break
+                    if on_stack[succ]:
+                        low[node] = min(low[node], order[succ])
+                if recurse:
+                    continue
+                
+                if low[node] == order[node]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack[member] = False
+                        component_of[member] = len(components)
+                        component.append(member)
+                        if member == node:
+                            break
+                    components.append(component)
+                
+                if work:
+                    parent = work[-1][0]
+                    low[parent] = min(low[parent], low[node])
+        
+        self._cache['scc'] = {'components': components, 'component_of': component_of}
+        return self._cache['scc']
+    
+    def condensed_graph(self, limit: Optional[int] = None) -> Dict:
+        """Collapse each SCC into one node; largest components (by bytes) first"""
+        graph = self._graph()
+        scc = self.strongly_connected_components()
+        components = scc['components']
+        component_of = scc['component_of']
+        root_set = set(graph['roots'])
+        
+        nodes = []
+        for cid, members in enumerate(components):
+            nodes.append({
+                'component_id': cid,
+                'objects': len(members),
+                'bytes': sum(graph['sizes'][m] for m in members),
+                'contains_root': any(m in root_set for m in members),
+                'cyclic': len(members) > 1 or members[0] in graph['successors'][members[0]],
+                'sample_ids': [graph['ids'][m] for m in members[:5]]
+            })
+        nodes.sort(key=lambda node: (-node['bytes'], node['component_id']))
+        if limit is not None:
+            nodes = nodes[:limit]
+        included = {node['component_id'] for node in nodes}
+        
+        edges = set()
+        for node, succs in enumerate(graph['successors']):
+            source = component_of[node]
+            if source not in included:
+                continue
+            for succ in succs:
+                target = component_of[succ]
+                if target != source and target in included:
+                    edges.add((source, target))
+        
+        return {
+            'total_components': len(components),
+            'cyclic_components': sum(1 for c in components if len(c) > 1),
+            'nodes': nodes,
+            'edges': [{'from': s, 'to': t} for s, t in sorted(edges)]
+        }
+    
+    def dominator_tree(self) -> Dict:
+        """Cooper-Harvey-Kennedy dominators from a virtual root above the root set"""
+        self._ensure_fresh()
+        if 'dominators' in self._cache:
+            return self._cache['dominators']
+        
+        graph = self._graph()
+        successors = graph['successors']
+        n = len(successors)
+        virtual_root = n
+        
+        def succs_of(node: int) -> List[int]:
+            return graph['roots'] if node == virtual_root else successors[node]
+        
+        # Iterative DFS for a postorder numbering of reachable nodes
+        postorder: List[int] = []
+        visited = [False] * (n + 1)
+        visited[virtual_root] = True
+        work = [(virtual_root, 0)]
+        while work:
+            node, edge = work.pop()
+            edges = succs_of(node)
+            while edge < len(edges) and visited[edges[edge]]:
+                edge += 1
+            if edge < len(edges):
+                succ = edges[edge]
+                visited[succ] = True
+                work.append((node, edge + 1))
+                work.append((succ, 0))
+            else:
+                postorder.append(node)
+        
+        post_index = [-1] * (n + 1)
+        for i, node in enumerate(postorder):
+            post_index[node] = i
+        reverse_postorder = postorder[::-1]
+        
+        predecessors: List[List[int]] = [[] for _ in range(n + 1)]
+        for node in reverse_postorder:
+            for succ in succs_of(node):
+                predecessors[succ].append(node)
+        
+        idom = [-1] * (n + 1)
+        idom[virtual_root] = virtual_root
+        
+        def intersect(a: int, b: int) -> int:
+            while a != b:
+                while post_index[a] < post_index[b]:
+                    a = idom[a]
+                while post_index[b] < post_index[a]:
+                    b = idom[b]
+            return a
+        
+        changed = True
+        while changed:
+            changed = False
+            for node in reverse_postorder[1:]:
+                new_idom = -1
+                for pred in predecessors[node]:
+                    if idom[pred] == -1:
+                        continue
+                    new_idom = pred if new_idom == -1 else intersect(pred, new_idom)
+                if idom[node] != new_idom:
+                    idom[node] = new_idom
+                    changed = True
+        
+        self._cache['dominators'] = {
+            'idom': idom,
+            'reverse_postorder': reverse_postorder,
+            'virtual_root': virtual_root
+        }
+        return self._cache['dominators']
+    
+    def retained_sizes(self) -> Dict:
+        """Bytes and objects kept alive by each reachable object (its dominator subtree)"""
+        self._ensure_fresh()
+        if 'retained' in self._cache:
+            return self._cache['retained']
+        
+        graph = self._graph()
+        dom = self.dominator_tree()
+        idom = dom['idom']
+        virtual_root = dom['virtual_root']
+        retained_bytes = graph['sizes'] + [0]
+        retained_objects = [1] * len(graph['sizes']) + [0]
+        
+        # Children come after their dominator in reverse postorder, so walk it backwards
+        for node in reversed(dom['reverse_postorder']):
+            if node == virtual_root:
+                continue
+            parent = idom[node]
+            retained_bytes[parent] += retained_bytes[node]
+            retained_objects[parent] += retained_objects[node]
+        
+        self._cache['retained'] = {
+            'bytes': retained_bytes,
+            'objects': retained_objects
+        }
+        return self._cache['retained']
+    
+    def top_retainers(self, limit: int = 10) -> Dict:
+        """The objects whose removal would free the most memory"""
+        graph = self._graph()
+        dom = self.dominator_tree()
+        retained = self.retained_sizes()
+        idom = dom['idom']
+        virtual_root = dom['virtual_root']
+        reachable = [node for node in dom['reverse_postorder'] if node != virtual_root]
+        
+        reachable.sort(key=lambda node: -retained['bytes'][node])
+        retainers = []
+        for node in reachable[:limit]:
+            parent = idom[node]
+            retainers.append({
+                'id': graph['ids'][node],
+                'root': node in graph['roots'],
+                'shallow_bytes': graph['sizes'][node],
+                'retained_bytes': retained['bytes'][node],
+                'retained_objects': retained['objects'][node],
+                'dominator': None if parent == virtual_root else graph['ids'][parent]
+            })
+        
+        return {
+            'reachable_objects': len(reachable),
+            'reachable_bytes': retained['bytes'][virtual_root],
+            'unreachable_objects': len(graph['ids']) - len(reachable),
+            'retainers': retainers
+        }
+    
+    def dominator_path(self, block_id: str) -> Optional[List[str]]:
+        """Chain of dominators from the root set down to a block, or None if unreachable"""
+        graph = self._graph()
+        node = graph['index'].get(block_id)
+        if node is None:
+            return None
+        dom = self.dominator_tree()
+        idom = dom['idom']
+        if idom[node] == -1:
+            return None
+        
+        path = []
+        while node != dom['virtual_root']:
+            path.append(graph['ids'][node])
+            node = idom[node]
+        return path[::-1]
@@ -1,104 +1,115 @@
 from typing import Dict, List, Set
-from .memory import HeapSimulator, MemoryBlock
+from .memory import HeapSimulator
+from .cost_model import WORD_SIZE
 from datetime import datetime, timezone
+from collections import deque
 import time
-import uuid
 
 class CopyingGC:
     """Copying Garbage Collector (Semi-space)"""
     
-    def __init__(self, heap: HeapSimulator):
+    ORDERS = ('depth-first', 'breadth-first')
+    
+    def __init__(self, heap: HeapSimulator, order: str = 'depth-first'):
+        if order not in self.ORDERS:
+            raise ValueError(f"Unknown copying order: {order}")
         self.heap = heap
         self.name = "Copying (Semi-space)"
-        # In copying GC, we use two semi-spaces
-        self.from_space = set()  # IDs in from-space
-        self.to_space = set()    # IDs in to-space
-        
-        # Initially all objects are in from-space
-        self.from_space = set(self.heap.blocks.keys())
+        self.order = order  # depth-first keeps parents next to children; breadth-first is Cheney's scan
+        self.space_base = 0  # Address where the current semi-space starts
     
-    def _copy_object(self, block_id: str, copied: Dict[str, str]) -> str:
-        """Copy an object from from-space to to-space"""
-        if block_id in copied:
-            return copied[block_id]
-        
-        if block_id not in self.heap.blocks:
-            return block_id
-        
-        old_block = self.heap.blocks[block_id]
-        
-        # Create new block ("copy" to to-space)
-        new_id = str(uuid.uuid4())[:8]
-        new_block = MemoryBlock(
-            id=new_id,
-            size=old_block.size,
-            allocated=True,
-            generation=old_block.generation,
-            root=old_block.root,
-            age=old_block.age + 1
-        )
-        
-        copied[block_id] = new_id
-        self.to_space.add(new_id)
-        
-        # Copy references recursively
-        for ref_id in old_block.references:
-            new_ref_id = self._copy_object(ref_id, copied)
-            new_block.references.add(new_ref_id)
-        
-        self.heap.blocks[new_id] = new_block
-        
-        # Update roots if necessary
-        if old_block.root:
-            self.heap.roots.add(new_id)
-            if block_id in self.heap.roots:
-                self.heap.roots.remove(block_id)
-        
-        return new_id
+    def _evacuation_order(self) -> List[str]:
+        """Reachable objects in the order they are copied to to-space"""
+        blocks = self.heap.blocks
+        roots = sorted(root_id for root_id in self.heap.roots if root_id in blocks)
+        copied: Set[str] = set()
+        order: List[str] = []
+        
+        if self.order == 'breadth-first':
+            # Cheney: to-space itself is the queue
+            queue = deque()
+            for root_id in roots:
+                if root_id not in copied:
+                    copied.add(root_id)
+                    order.append(root_id)
+                    queue.append(root_id)
+            while queue:
+                block = blocks[queue.popleft()]
+                for ref_id in sorted(block.references):
+                    if ref_id in blocks and ref_id not in copied:
+                        copied.add(ref_id)
+                        order.append(ref_id)
+                        queue.append(ref_id)
+            return order
+        
+        # Depth-first: copy an object, then immediately the objects it references
+        stack = roots[::-1]
+        while stack:
+            block_id = stack.pop()
+            if block_id in copied:
+                continue
+            copied.add(block_id)
+            order.append(block_id)
+            for ref_id in sorted(blocks[block_id].references, reverse=True):
+                if ref_id in blocks and ref_id not in copied:
+                    stack.append(ref_id)
+        return order
     
     def collect(self) -> Dict:
         """Run copying garbage collection"""
-        start_time = time.time()
+        self.heap.finish_pending_sweep()
         
-        copied = {}  # Mapping from old ID to new ID
-        self.to_space.clear()
+        start_time = time.time()
         
         original_count = len(self.heap.blocks)
-        
-        # Copy all reachable objects starting from roots
-        for root_id in list(self.heap.roots):
-            self._copy_object(root_id, copied)
-        
-        # Remove all objects in from-space that weren't copied
+        roots_scanned = len(self.heap.roots)
+        
+        # Copy all reachable objects starting from roots, compacting them into the other semi-space
+        order = self._evacuation_order()
+        to_base = self.heap.num_blocks if self.space_base == 0 else 0
+        free_pointer = to_base
+        for block_id in order:
+            block = self.heap.blocks[block_id]
+            self.heap.touch(block)  # Read from from-space
+            block.address = free_pointer
+            self.heap.touch(block)  # Write to to-space
+            free_pointer += block.size
+            block.age += 1
+        copied = set(order)
+        
+        # Everything left behind in from-space is garbage
         bytes_reclaimed = 0
-        blocks_to_remove = []
-        
-        for block_id in self.from_space:
-            if block_id not in copied and block_id in self.heap.blocks:
-                block = self.heap.blocks[block_id]
-                bytes_reclaimed += block.size * self.heap.block_size
-                blocks_to_remove.append(block_id)
-        
+        blocks_to_remove = [block_id for block_id in self.heap.blocks if block_id not in copied]
         for block_id in blocks_to_remove:
-            if block_id in self.heap.blocks:
-                del self.heap.blocks[block_id]
-                self.heap.allocated_blocks -= self.heap.blocks.get(block_id, MemoryBlock(id='', size=1)).size
-                self.heap.free_blocks += self.heap.blocks.get(block_id, MemoryBlock(id='', size=1)).size
+            bytes_reclaimed += self.heap.blocks[block_id].size * self.heap.block_size
+            self.heap.deallocate(block_id)
         
-        # Swap spaces
-        self.from_space = self.to_space.copy()
-        self.to_space.clear()
+        # Swap spaces: from-space is now empty, allocation continues after the copies
+        self.space_base = to_base
+        self.heap.holes = []
+        self.heap.next_address = free_pointer
         
         end_time = time.time()
         pause_duration = (end_time - start_time) * 1000
         
-        return {
+        metrics = {
             'algorithm': self.name,
+            'copy_order': self.order,
             'objects_scanned': original_count,
-            'objects_copied': len(copied),
+            'objects_copied': len(order),
             'objects_freed': len(blocks_to_remove),
             'bytes_reclaimed': bytes_reclaimed,
             'pause_duration': round(pause_duration, 3),
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'compaction': True
         }
+        if self.heap.cost_model is not None:
+            # Evacuation touches only live objects; dead ones are dropped without a sweep
+            copies = [self.heap.blocks[block_id] for block_id in order]
+            metrics.update(self.heap.cost_model.price({
+                'roots_scanned': roots_scanned,
+                'objects_marked': len(copies),
+                'edges_traced': sum(len(block.references) for block in copies),
+                'words_copied': sum(block.size * self.heap.block_size // WORD_SIZE for block in copies)
+            }))
+        return metrics
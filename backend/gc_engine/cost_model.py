@@ -0,0 +1,47 @@
+from typing import Dict
+from dataclasses import dataclass, asdict
+
+# Work categories every collector reports in cost-model mode
+WORK_CATEGORIES = (
+    'roots_scanned', 'objects_marked', 'edges_traced',
+    'words_copied', 'objects_swept', 'refcount_updates'
+)
+
+WORD_SIZE = 8  # Bytes per word when charging for copying
+
+@dataclass
+class CostModel:
+    """Deterministic pause accounting in abstract work units.
+
+    Collectors count the operations they perform; pricing those counts gives a
+    virtual pause that depends only on the algorithm and the heap shape, not on
+    interpreter overhead or machine load.
+    """
+    root_scan: float = 5.0
+    mark_object: float = 10.0
+    trace_edge: float = 2.0
+    copy_word: float = 1.0
+    sweep_object: float = 3.0
+    refcount_update: float = 1.0
+    ms_per_unit: float = 0.0001  # 100ns per work unit
+
+    def price(self, work: Dict[str, int]) -> Dict:
+        """Turn operation counts into virtual work units and a virtual pause"""
+        counts = {category: work.get(category, 0) for category in WORK_CATEGORIES}
+        units = (
+            counts['roots_scanned'] * self.root_scan
+            + counts['objects_marked'] * self.mark_object
+            + counts['edges_traced'] * self.trace_edge
+            + counts['words_copied'] * self.copy_word
+            + counts['objects_swept'] * self.sweep_object
+            + counts['refcount_updates'] * self.refcount_update
+        )
+        return {
+            'work': counts,
+            'virtual_work': round(units, 3),
+            'virtual_pause': round(units * self.ms_per_unit, 6)
+        }
+
+    def to_dict(self) -> Dict:
+        """Get the configured unit costs"""
+        return asdict(self)
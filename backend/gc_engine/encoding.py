@@ -0,0 +1,49 @@
+from typing import Dict, List, Sequence
+import json
+
+# Optional accelerators: orjson for JSON, msgpack for the binary encoding
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+def dumps_json(data) -> bytes:
+    """Serialize to compact JSON, using orjson when it is installed"""
+    if orjson is not None:
+        return orjson.dumps(data)
+    return json.dumps(data, separators=(',', ':')).encode('utf-8')
+
+def to_columnar(rows: List[Dict], fields: Sequence[str]) -> Dict:
+    """Pack block rows into one array per field.
+    
+    References are flattened CSR-style: ``references`` holds every target id
+    and ``reference_offsets[i]:reference_offsets[i + 1]`` is the slice for row i.
+    """
+    columns = {}
+    for name in fields:
+        if name == 'references':
+            flat = []
+            offsets = [0]
+            for row in rows:
+                flat.extend(row['references'])
+                offsets.append(len(flat))
+            columns['references'] = flat
+            columns['reference_offsets'] = offsets
+        else:
+            columns[name] = [row[name] for row in rows]
+    return columns
+
+def msgpack_available() -> bool:
+    """Whether the msgpack encoding can be served"""
+    return msgpack is not None
+
+def dumps_msgpack(data) -> bytes:
+    """Serialize to msgpack"""
+    if msgpack is None:
+        raise RuntimeError("msgpack is not installed")
+    return msgpack.packb(data, use_bin_type=True)
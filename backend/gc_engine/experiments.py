@@ -0,0 +1,138 @@
+from typing import AsyncIterator, Dict, List, Optional
+from concurrent.futures import ProcessPoolExecutor
+import asyncio
+import itertools
+import multiprocessing
+import random
+import time
+from .memory import HeapSimulator
+from .mark_sweep import MarkSweepGC
+from .reference_counting import ReferenceCountingGC
+from .generational import GenerationalGC
+from .copying import CopyingGC
+from .region import RegionGC
+from .workload import WorkloadGenerator
+from .cost_model import CostModel
+from .metrics import percentile
+
+COLLECTORS = {
+    'mark-sweep': MarkSweepGC,
+    'reference-counting': ReferenceCountingGC,
+    'generational': GenerationalGC,
+    'copying': CopyingGC,
+    'region': RegionGC
+}
+
+WORKLOAD_TYPES = ('random', 'circular', 'long-lived', 'short-lived', 'mixed')
+
+MAJOR_INTERVAL = 4  # Every n-th generational collection in a run is a major one
+
+def expand_grid(grid: Dict[str, List]) -> List[Dict]:
+    """All combinations of the grid's values; promotion_age only varies for the generational collector"""
+    names = [name for name in grid if name != 'promotion_age']
+    configs = []
+    for values in itertools.product(*(grid[name] for name in names)):
+        config = dict(zip(names, values))
+        if config.get('algorithm') == 'generational':
+            for promotion_age in grid.get('promotion_age', [2]):
+                configs.append({**config, 'promotion_age': promotion_age})
+        else:
+            configs.append({**config, 'promotion_age': None})
+    return configs
+
+def grid_size(grid: Dict[str, List]) -> int:
+    """Number of configurations expand_grid would produce, without building them"""
+    size = 1
+    for name, values in grid.items():
+        if name not in ('algorithm', 'promotion_age'):
+            size *= len(values)
+    algorithms = grid.get('algorithm', [None])
+    generational = sum(1 for algorithm in algorithms if algorithm == 'generational')
+    return size * (len(algorithms) - generational + generational * len(grid.get('promotion_age', [2])))
+
+def run_configuration(index: int, config: Dict, rounds: int, seed: int, use_cost_model: bool) -> Dict:
+    """Run one configuration on a fresh heap: a workload followed by a collection, ``rounds`` times"""
+    row = {'index': index, **config}
+    try:
+        random.seed(seed)  # Workloads draw from the module-level generator
+        heap = HeapSimulator(total_size=config['total_size'], block_size=config['block_size'])
+        if use_cost_model:
+            heap.cost_model = CostModel()
+        if config['algorithm'] == 'generational':
+            gc = GenerationalGC(heap, promotion_age=config['promotion_age'])
+        else:
+            gc = COLLECTORS[config['algorithm']](heap)
+        workload = WorkloadGenerator(heap)
+        
+        pauses = []
+        virtual_pauses = []
+        allocated = 0
+        requested = 0
+        freed = 0
+        peak_occupancy = 0.0
+        start_time = time.perf_counter()
+        for cycle in range(1, rounds + 1):
+            result = workload.run(
+                config['workload'],
+                count=config['count'],
+                root_prob=config['root_prob'],
+                ref_density=config['ref_density']
+            )
+            allocated += result.get('count', result.get('total', 0))
+            requested += 10 if config['workload'] == 'mixed' else config['count']
+            peak_occupancy = max(peak_occupancy, heap.allocated_blocks / heap.num_blocks)
+            
+            if config['algorithm'] == 'generational':
+                metrics = gc.collect(minor_only=cycle % MAJOR_INTERVAL != 0)
+            else:
+                metrics = gc.collect()
+            pauses.append(metrics['pause_duration'])
+            freed += metrics.get('objects_freed', 0)
+            if 'virtual_pause' in metrics:
+                virtual_pauses.append(metrics['virtual_pause'])
+        elapsed = time.perf_counter() - start_time
+    except Exception as e:
+        row['error'] = str(e)
+        return row
+    
+    pauses.sort()
+    row.update({
+        'cycles': rounds,
+        'objects_allocated': allocated,
+        'allocation_failures': requested - allocated,
+        'objects_freed': freed,
+        'elapsed': round(elapsed, 4),
+        'throughput': round(allocated / elapsed, 1) if elapsed > 0 else 0.0,
+        'gc_time_fraction': round(sum(pauses) / 1000 / elapsed, 4) if elapsed > 0 else 0.0,
+        'pause_p50': round(percentile(pauses, 50), 3),
+        'pause_p95': round(percentile(pauses, 95), 3),
+        'pause_p99': round(percentile(pauses, 99), 3),
+        'pause_max': round(pauses[-1], 3),
+        'peak_occupancy': round(peak_occupancy, 4)
+    })
+    if virtual_pauses:
+        virtual_pauses.sort()
+        row.update({
+            'virtual_pause_p50': round(percentile(virtual_pauses, 50), 6),
+            'virtual_pause_p95': round(percentile(virtual_pauses, 95), 6),
+            'virtual_pause_p99': round(percentile(virtual_pauses, 99), 6),
+            'virtual_pause_max': round(virtual_pauses[-1], 6)
+        })
+    return row
+
+async def run_sweep(configs: List[Dict], rounds: int = 20, seed: int = 0, use_cost_model: bool = False,
+                    max_workers: Optional[int] = None) -> AsyncIterator[Dict]:
+    """Run configurations in separate processes, yielding each table row as soon as it completes"""
+    loop = asyncio.get_running_loop()
+    # Spawned workers share nothing with the server process, so runs cannot see each other's state
+    pool = ProcessPoolExecutor(max_workers=max_workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        futures = [
+            loop.run_in_executor(pool, run_configuration, index, config, rounds, seed, use_cost_model)
+            for index, config in enumerate(configs)
+        ]
+        for future in asyncio.as_completed(futures):
+            yield await future
+    finally:
+        # Returns at once if the client went away; queued runs are dropped
+        pool.shutdown(wait=False, cancel_futures=True)
@@ -1,5 +1,5 @@
 from typing import Dict, List, Set
-from .memory import HeapSimulator
+from .memory import HeapSimulator, HEADER_BYTES
 from datetime import datetime, timezone
 import time
 
@@ -10,6 +10,7 @@ class GenerationalGC:
         self.heap = heap
         self.name = "Generational"
         self.promotion_age = promotion_age  # Age at which objects get promoted
+        self.work: Dict[str, int] = {}  # Operation counts for the current collection
         
     def mark(self, block_id: str, marked: Set[str]):
         """Recursively mark reachable objects"""
@@ -19,6 +20,7 @@ class GenerationalGC:
         marked.add(block_id)
         block = self.heap.blocks[block_id]
         block.marked = True
+        self.heap.touch(block)
         
         for ref_id in block.references:
             self.mark(ref_id, marked)
@@ -31,12 +33,21 @@ class GenerationalGC:
         for root_id in self.heap.roots:
             self.mark(root_id, marked)
         
+        self._count('roots_scanned', len(self.heap.roots))
+        self._count('objects_marked', len(marked))
+        self._count('edges_traced', sum(len(self.heap.blocks[b].references) for b in marked))
+        
         # Sweep unmarked objects in this generation
         blocks_to_remove = []
         blocks_to_promote = []
+        sites = self.heap.sites if generation == 0 else None
         
         for block_id, block in self.heap.blocks.items():
             if block.generation == generation:
+                self._count('objects_swept', 1)
+                self.heap.touch(block, HEADER_BYTES)
+                if sites is not None and block.site is not None and block.age == 0:
+                    sites.record_survival(block.site, block.marked)
                 if not block.marked:
                     blocks_to_remove.append(block_id)
                 else:
@@ -62,9 +73,16 @@ class GenerationalGC:
         
         return len(blocks_to_remove), bytes_reclaimed, len(blocks_to_promote)
     
+    def _count(self, category: str, amount: int):
+        """Accumulate an operation count for the cost model"""
+        self.work[category] = self.work.get(category, 0) + amount
+    
     def collect(self, minor_only: bool = True) -> Dict:
         """Run generational garbage collection"""
+        self.heap.finish_pending_sweep()
+        
         start_time = time.time()
+        self.work = {}
         
         total_freed = 0
         total_bytes = 0
@@ -88,7 +106,7 @@ class GenerationalGC:
         end_time = time.time()
         pause_duration = (end_time - start_time) * 1000
         
-        return {
+        metrics = {
             'algorithm': self.name,
             'collection_type': collection_type,
             'objects_scanned': len(self.heap.blocks) + total_freed,
@@ -98,3 +116,12 @@ class GenerationalGC:
             'pause_duration': round(pause_duration, 3),
             'timestamp': datetime.now(timezone.utc).isoformat()
         }
+        if self.heap.cost_model is not None:
+            metrics.update(self.heap.cost_model.price(self.work))
+        if self.heap.sites is not None:
+            metrics['pretenuring'] = self.heap.sites.after_collection(self.heap.blocks, self.promotion_age)
+            if self.heap.cost_model is not None:
+                # Pretenured objects skip the young-generation sweeps they would have gone through
+                saved = {'objects_swept': metrics['pretenuring']['young_scans_avoided']}
+                metrics['pretenuring']['saved_virtual_work'] = self.heap.cost_model.price(saved)['virtual_work']
+        return metrics
@@ -0,0 +1,190 @@
+from typing import Dict, List, Optional, Tuple
+import sys
+from .memory import HeapSimulator, BLOCK_FIELDS
+
+RECORD_FIELDS = BLOCK_FIELDS[1:]  # A record is a block's fields without its id
+REFERENCES = RECORD_FIELDS.index('references')
+ROOT = RECORD_FIELDS.index('root')
+
+class HeapHistory:
+    """Checkpoints of the heap before and after each recorded GC cycle.
+    
+    Blocks are stored as immutable records that are shared between
+    checkpoints for as long as the block does not change. Every
+    ``keyframe_interval`` checkpoints a keyframe maps every live block to its
+    record; the checkpoints in between only hold the records that changed and
+    the ids that disappeared. The oldest checkpoints are dropped once the
+    estimated size exceeds ``memory_budget`` bytes.
+    """
+    
+    def __init__(self, heap: HeapSimulator, keyframe_interval: int = 16, memory_budget: int = 16 << 20):
+        if keyframe_interval < 1:
+            raise ValueError("Keyframe interval must be at least 1")
+        if memory_budget <= 0:
+            raise ValueError("Memory budget must be positive")
+        self.heap = heap
+        self.keyframe_interval = keyframe_interval
+        self.memory_budget = memory_budget
+        self.clear()
+    
+    def clear(self):
+        """Forget every checkpoint"""
+        self.checkpoints: List[Dict] = []
+        self.first_seq = 0  # Sequence number of checkpoints[0]
+        self.cycles: Dict[Tuple[int, str], int] = {}  # (cycle id, 'before'/'after') -> sequence number
+        self.head: Dict[str, tuple] = {}  # Records as of the latest checkpoint
+        self.pending_before: Optional[int] = None
+        self.estimated_bytes = 0
+        self.evicted_checkpoints = 0
+    
+    def _record(self, block, previous: Optional[tuple]) -> tuple:
+        """Immutable record of a block, reusing the previous record or reference set when unchanged"""
+        references = block.references
+        if previous is not None and previous[REFERENCES] == references:
+            references = previous[REFERENCES]
+        else:
+            references = frozenset(references)
+        record = (block.size, block.allocated, block.marked, block.generation, references,
+                  block.age, block.root, block.address, block.site)
+        if record == previous:
+            return previous
+        return record
+    
+    @staticmethod
+    def _record_bytes(record: tuple) -> int:
+        """Approximate memory held by a record"""
+        return sys.getsizeof(record) + sys.getsizeof(record[REFERENCES])
+    
+    def checkpoint(self) -> int:
+        """Record the current heap; returns the checkpoint's sequence number"""
+        blocks = self.heap.blocks
+        head = self.head
+        changed = {}
+        size = 0
+        for block_id, block in blocks.items():
+            previous = head.get(block_id)
+            record = self._record(block, previous)
+            if record is not previous:
+                changed[block_id] = record
+                size += self._record_bytes(record)
+        removed = [block_id for block_id in head if block_id not in blocks]
+        head.update(changed)
+        for block_id in removed:
+            del head[block_id]
+        
+        entry = {
+            'cycle_id': None,
+            'phase': None,
+            'stats': self.heap.get_stats()
+        }
+        since_keyframe = len(self.checkpoints) - self._keyframe_position(len(self.checkpoints) - 1)
+        if not self.checkpoints or since_keyframe >= self.keyframe_interval:
+            # A keyframe keeps all of its records alive on its own, so all of them are charged
+            entry['keyframe'] = dict(head)
+            size = sys.getsizeof(entry['keyframe']) + sum(self._record_bytes(record) for record in head.values())
+        else:
+            entry['changed'] = changed
+            entry['removed'] = removed
+            size += sys.getsizeof(changed) + sys.getsizeof(removed)
+        entry['bytes'] = size
+        
+        self.checkpoints.append(entry)
+        self.estimated_bytes += size
+        self._enforce_budget()
+        return self.first_seq + len(self.checkpoints) - 1
+    
+    def _keyframe_position(self, position: int) -> int:
+        """Position of the keyframe a checkpoint is reconstructed from"""
+        while position > 0 and 'keyframe' not in self.checkpoints[position]:
+            position -= 1
+        return position
+    
+    def _enforce_budget(self):
+        """Drop the oldest checkpoints while over budget, always keeping the latest one"""
+        while self.estimated_bytes > self.memory_budget and len(self.checkpoints) > 1:
+            next_keyframe = next(
+                (i for i in range(1, len(self.checkpoints)) if 'keyframe' in self.checkpoints[i]),
+                None
+            )
+            if next_keyframe is None:
+                # Only one segment left: turn its second checkpoint into a keyframe so the first can go
+                second = self.checkpoints[1]
+                keyframe = self._state(1)
+                self.estimated_bytes -= second['bytes']
+                second['keyframe'] = keyframe
+                del second['changed'], second['removed']
+                second['bytes'] = sys.getsizeof(keyframe) + sum(self._record_bytes(record) for record in keyframe.values())
+                self.estimated_bytes += second['bytes']
+                next_keyframe = 1
+            for entry in self.checkpoints[:next_keyframe]:
+                self.estimated_bytes -= entry['bytes']
+                if entry['cycle_id'] is not None:
+                    del self.cycles[(entry['cycle_id'], entry['phase'])]
+            del self.checkpoints[:next_keyframe]
+            self.first_seq += next_keyframe
+            self.evicted_checkpoints += next_keyframe
+    
+    def capture_before(self):
+        """Checkpoint the heap as a collection starts"""
+        self.pending_before = self.checkpoint()
+    
+    def capture_after(self, cycle_id: int):
+        """Checkpoint the heap after a collection and label both checkpoints with its cycle id"""
+        after = self.checkpoint()
+        if self.pending_before is not None:
+            self._label(self.pending_before, cycle_id, 'before')
+            self.pending_before = None
+        self._label(after, cycle_id, 'after')
+    
+    def _label(self, seq: int, cycle_id: int, phase: str):
+        """Attach a cycle id to a checkpoint that has not been evicted"""
+        if seq < self.first_seq:
+            return
+        entry = self.checkpoints[seq - self.first_seq]
+        entry['cycle_id'] = cycle_id
+        entry['phase'] = phase
+        self.cycles[(cycle_id, phase)] = seq
+    
+    def _state(self, position: int) -> Dict[str, tuple]:
+        """Rebuild the block records of a checkpoint from its keyframe and the deltas after it"""
+        start = self._keyframe_position(position)
+        state = dict(self.checkpoints[start]['keyframe'])
+        for entry in self.checkpoints[start + 1:position + 1]:
+            state.update(entry['changed'])
+            for block_id in entry['removed']:
+                state.pop(block_id, None)
+        return state
+    
+    def get_heap(self, cycle_id: int, phase: str = 'after') -> Optional[Dict]:
+        """The heap as it was before or after a cycle, or None if it was never recorded or was evicted"""
+        seq = self.cycles.get((cycle_id, phase))
+        if seq is None:
+            return None
+        position = seq - self.first_seq
+        state = self._state(position)
+        blocks = []
+        for block_id, record in state.items():
+            block = {'id': block_id}
+            block.update(zip(RECORD_FIELDS, record))
+            block['references'] = list(record[REFERENCES])
+            blocks.append(block)
+        return {
+            'cycle_id': cycle_id,
+            'phase': phase,
+            'stats': self.checkpoints[position]['stats'],
+            'blocks': blocks,
+            'roots': [block_id for block_id, record in state.items() if record[ROOT]]
+        }
+    
+    def get_stats(self) -> Dict:
+        """Checkpoint counts, recorded cycles and estimated memory use"""
+        recorded = sorted({cycle_id for cycle_id, _ in self.cycles})
+        return {
+            'keyframe_interval': self.keyframe_interval,
+            'memory_budget': self.memory_budget,
+            'estimated_bytes': self.estimated_bytes,
+            'checkpoints': len(self.checkpoints),
+            'keyframes': sum(1 for entry in self.checkpoints if 'keyframe' in entry),
+            'evicted_checkpoints': self.evicted_checkpoints,
+            'cycles': recorded
+        }
@@ -0,0 +1,139 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from collections import OrderedDict, deque
+from .memory import HeapSimulator
+
+class CacheLevel:
+    """Set-associative cache with LRU replacement (also used to model a TLB)"""
+    
+    def __init__(self, name: str, size: int, line_size: int, associativity: int):
+        if size <= 0 or line_size <= 0 or associativity <= 0:
+            raise ValueError(f"{name}: size, line size and associativity must be positive")
+        self.name = name
+        self.line_size = line_size
+        self.associativity = associativity
+        self.num_sets = max(1, size // (line_size * associativity))
+        self.sets: List[OrderedDict] = [OrderedDict() for _ in range(self.num_sets)]
+        self.hits = 0
+        self.misses = 0
+    
+    def access(self, address: int) -> bool:
+        """Look up the line holding a byte address; returns True on a hit"""
+        line = address // self.line_size
+        ways = self.sets[line % self.num_sets]
+        if line in ways:
+            ways.move_to_end(line)
+            self.hits += 1
+            return True
+        self.misses += 1
+        ways[line] = True
+        if len(ways) > self.associativity:
+            ways.popitem(last=False)
+        return False
+    
+    def get_stats(self) -> Dict:
+        """Get hit/miss counts and miss rate"""
+        accesses = self.hits + self.misses
+        return {
+            'accesses': accesses,
+            'hits': self.hits,
+            'misses': self.misses,
+            'miss_rate': round(self.misses / accesses, 4) if accesses else 0.0
+        }
+
+class MemoryHierarchy:
+    """A TLB plus one or two cache levels that byte-range accesses are replayed through"""
+    
+    def __init__(self, l1: Dict, tlb: Dict, l2: Optional[Dict] = None):
+        self.l1 = CacheLevel('l1', l1['size'], l1['line_size'], l1['associativity'])
+        self.l2 = CacheLevel('l2', l2['size'], l2['line_size'], l2['associativity']) if l2 else None
+        self.tlb = CacheLevel('tlb', tlb['entries'] * tlb['page_size'], tlb['page_size'], tlb['associativity'])
+    
+    def access(self, address: int, nbytes: int):
+        """Touch every cache line of a byte range"""
+        line_size = self.l1.line_size
+        first = address - address % line_size
+        for line_address in range(first, address + max(nbytes, 1), line_size):
+            self.tlb.access(line_address)
+            if not self.l1.access(line_address) and self.l2 is not None:
+                self.l2.access(line_address)
+    
+    def replay(self, trace: List[Tuple[int, int]]) -> Dict:
+        """Replay (byte address, bytes) accesses and report per-level statistics"""
+        for address, nbytes in trace:
+            self.access(address, nbytes)
+        stats = {'l1': self.l1.get_stats(), 'tlb': self.tlb.get_stats()}
+        if self.l2 is not None:
+            stats['l2'] = self.l2.get_stats()
+        return stats
+
+DEFAULT_HIERARCHY = {
+    'l1': {'size': 32 * 1024, 'line_size': 64, 'associativity': 8},
+    'l2': {'size': 256 * 1024, 'line_size': 64, 'associativity': 8},
+    'tlb': {'entries': 64, 'page_size': 4096, 'associativity': 4}
+}
+
+def mutator_trace(heap: HeapSimulator, traversal: str = 'depth-first') -> List[Tuple[int, int]]:
+    """Accesses of a mutator walking the object graph from the roots, reading each object once"""
+    blocks = heap.blocks
+    roots = sorted(root_id for root_id in heap.roots if root_id in blocks)
+    seen = set(roots)
+    trace = []
+    
+    if traversal == 'breadth-first':
+        queue = deque(roots)
+        while queue:
+            block = blocks[queue.popleft()]
+            trace.append((block.address * heap.block_size, block.size * heap.block_size))
+            for ref_id in sorted(block.references):
+                if ref_id in blocks and ref_id not in seen:
+                    seen.add(ref_id)
+                    queue.append(ref_id)
+        return trace
+    
+    stack = roots[::-1]
+    while stack:
+        block = blocks[stack.pop()]
+        trace.append((block.address * heap.block_size, block.size * heap.block_size))
+        for ref_id in sorted(block.references, reverse=True):
+            if ref_id in blocks and ref_id not in seen:
+                seen.add(ref_id)
+                stack.append(ref_id)
+    return trace
+
+def analyze_locality(heap: HeapSimulator, collectors: Dict[str, Callable], hierarchy: Dict = None,
+                     traversal: str = 'depth-first') -> Dict:
+    """Replay collector and mutator accesses for each collector on its own copy of the heap.
+    
+    For every collector this reports the cache behaviour of the collection itself
+    and of a mutator traversal over the layout the collector leaves behind,
+    next to the same traversal over the layout before collection.
+    """
+    hierarchy = hierarchy or DEFAULT_HIERARCHY
+    
+    def replay(trace):
+        return MemoryHierarchy(hierarchy['l1'], hierarchy['tlb'], hierarchy.get('l2')).replay(trace)
+    
+    results = {
+        'traversal': traversal,
+        'objects': len(heap.blocks),
+        'mutator_before': replay(mutator_trace(heap, traversal)),
+        'collectors': {}
+    }
+    
+    for name, factory in collectors.items():
+        clone = heap.clone()
+        clone.cost_model = None
+        gc = factory(clone)
+        clone.access_trace = []
+        metrics = gc.collect()
+        collector_trace = clone.access_trace
+        clone.access_trace = None
+        
+        results['collectors'][name] = {
+            'objects_freed': metrics.get('objects_freed', 0),
+            'collector_accesses': len(collector_trace),
+            'collector': replay(collector_trace),
+            'mutator_after': replay(mutator_trace(clone, traversal))
+        }
+    
+    return results
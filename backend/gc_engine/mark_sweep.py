@@ -1,14 +1,19 @@
-from typing import Dict, List, Set
-from .memory import HeapSimulator, MemoryBlock
+from typing import Dict, List, Set, Optional
+from .memory import HeapSimulator, MemoryBlock, HEADER_BYTES
 from datetime import datetime, timezone
 import time
 
 class MarkSweepGC:
     """Mark and Sweep Garbage Collector"""
     
-    def __init__(self, heap: HeapSimulator):
+    def __init__(self, heap: HeapSimulator, lazy: bool = False, sweep_chunk: int = 8):
         self.heap = heap
         self.name = "Mark-Sweep"
+        self.lazy = lazy  # Only mark during the pause; sweep on allocation
+        self.sweep_chunk = sweep_chunk  # Objects per lazily swept region
+        self.pending_regions: List[List[str]] = []
+        self.unswept: Set[str] = set()  # Ids in pending regions; their mark bits still decide whether they die
+        self.sweep_metrics: Optional[Dict] = None  # Cycle being swept lazily
         
     def mark(self, block_id: str, marked: Set[str]):
         """Recursively mark reachable objects"""
@@ -18,23 +23,38 @@ class MarkSweepGC:
         marked.add(block_id)
         block = self.heap.blocks[block_id]
         block.marked = True
+        self.heap.touch(block)
         
         # Recursively mark referenced objects
         for ref_id in block.references:
             self.mark(ref_id, marked)
     
-    def collect(self) -> Dict:
+    def collect(self, lazy: Optional[bool] = None) -> Dict:
         """Run mark and sweep garbage collection"""
+        if lazy is None:
+            lazy = self.lazy
+        
+        # Garbage left over from a previous lazy cycle must be swept before marking again
+        self.heap.finish_pending_sweep()
+        
         start_time = time.time()
+        
+        if self.heap.reachability is not None and not lazy:
+            return self._collect_indexed(start_time)
+        
         marked = set()
         
         # Mark phase: Start from roots
         for root_id in self.heap.roots:
             self.mark(root_id, marked)
         
+        if lazy:
+            return self._defer_sweep(start_time, marked)
+        
         # Sweep phase: Remove unmarked objects
         blocks_to_remove = []
         for block_id, block in self.heap.blocks.items():
+            self.heap.touch(block, HEADER_BYTES)
             if not block.marked:
                 blocks_to_remove.append(block_id)
             else:
@@ -52,7 +72,7 @@ class MarkSweepGC:
         end_time = time.time()
         pause_duration = (end_time - start_time) * 1000  # Convert to ms
         
-        return {
+        metrics = {
             'algorithm': self.name,
             'objects_scanned': len(self.heap.blocks) + len(blocks_to_remove),
             'objects_freed': len(blocks_to_remove),
@@ -61,3 +81,184 @@ class MarkSweepGC:
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'marked_objects': len(marked)
         }
+        self._charge(metrics, marked, metrics['objects_scanned'])
+        return metrics
+    
+    def _charge(self, metrics: Dict, marked: Set[str], swept: int):
+        """Add the virtual pause for a cycle when the heap has a cost model"""
+        if self.heap.cost_model is None:
+            return
+        metrics.update(self.heap.cost_model.price({
+            'roots_scanned': len(self.heap.roots),
+            'objects_marked': len(marked),
+            'edges_traced': sum(len(self.heap.blocks[b].references) for b in marked if b in self.heap.blocks),
+            'objects_swept': swept
+        }))
+    
+    def _collect_indexed(self, start_time: float) -> Dict:
+        """Skip marking: the heap's reachability index already knows the live set"""
+        index = self.heap.reachability
+        blocks_to_remove = list(index.garbage_set())
+        live = index.live_set()
+        
+        # Survivors still age; this is a flat pass with no pointer chasing
+        garbage = index.garbage_set()
+        for block_id, block in self.heap.blocks.items():
+            self.heap.touch(block, HEADER_BYTES)
+            if block_id not in garbage:
+                block.age += 1
+        
+        bytes_reclaimed = 0
+        for block_id in blocks_to_remove:
+            block = self.heap.blocks.get(block_id)
+            if block:
+                bytes_reclaimed += block.size * self.heap.block_size
+                self.heap.deallocate(block_id)
+        
+        pause_duration = (time.time() - start_time) * 1000
+        
+        metrics = {
+            'algorithm': self.name,
+            'reachability': 'incremental',
+            'objects_scanned': len(self.heap.blocks) + len(blocks_to_remove),
+            'objects_freed': len(blocks_to_remove),
+            'bytes_reclaimed': bytes_reclaimed,
+            'pause_duration': round(pause_duration, 3),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'marked_objects': len(live)
+        }
+        # Nothing is traced; only the aging/sweeping pass is charged
+        self._charge(metrics, set(), metrics['objects_scanned'])
+        return metrics
+    
+    def _defer_sweep(self, start_time: float, marked: Set[str]) -> Dict:
+        """End the pause after marking and leave the heap split into unswept regions"""
+        block_ids = list(self.heap.blocks.keys())
+        self.unswept = set(block_ids)
+        self.pending_regions = [
+            block_ids[i:i + self.sweep_chunk]
+            for i in range(0, len(block_ids), self.sweep_chunk)
+        ]
+        
+        pause_duration = (time.time() - start_time) * 1000
+        
+        self.sweep_metrics = {
+            'algorithm': self.name,
+            'sweep_mode': 'lazy',
+            'objects_scanned': len(block_ids),
+            'objects_freed': 0,
+            'bytes_reclaimed': 0,
+            'pause_duration': round(pause_duration, 3),
+            'mark_pause': round(pause_duration, 3),
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'marked_objects': len(marked),
+            'objects_pending_sweep': len(block_ids) - len(marked),
+            'regions_pending_sweep': len(self.pending_regions),
+            'sweep_time': 0.0,
+            'allocation_sweep_time': 0.0,
+            'sweep_allocations': 0,
+            'amortized_sweep_cost': 0.0
+        }
+        self._charge(self.sweep_metrics, marked, 0)
+        if self.heap.cost_model is not None:
+            self.sweep_metrics['virtual_sweep_time'] = 0.0
+        self.heap.sweeper = self if self.pending_regions else None
+        return self.sweep_metrics
+    
+    def _sweep_region(self, region: List[str]) -> tuple:
+        """Sweep one region, returning (objects freed, bytes reclaimed)"""
+        freed = 0
+        bytes_reclaimed = 0
+        for block_id in region:
+            self.unswept.discard(block_id)
+            block = self.heap.blocks.get(block_id)
+            if block is None:
+                continue
+            self.heap.touch(block, HEADER_BYTES)
+            if not block.marked:
+                bytes_reclaimed += block.size * self.heap.block_size
+                self.heap.deallocate(block_id)
+                freed += 1
+            else:
+                block.marked = False
+                block.age += 1
+        return freed, bytes_reclaimed
+    
+    def sweep(self, max_regions: Optional[int] = None, min_free: int = 0,
+              on_allocation: bool = False) -> int:
+        """Sweep pending regions until max_regions are done and min_free blocks are available"""
+        start_time = time.time()
+        swept = 0
+        freed = 0
+        bytes_reclaimed = 0
+        objects_swept = 0
+        
+        while self.pending_regions:
+            if max_regions is not None and swept >= max_regions and self.heap.free_blocks >= min_free:
+                break
+            region = self.pending_regions.pop(0)
+            objects_swept += len(region)
+            region_freed, region_bytes = self._sweep_region(region)
+            freed += region_freed
+            bytes_reclaimed += region_bytes
+            swept += 1
+        
+        if self.sweep_metrics is not None and swept:
+            metrics = self.sweep_metrics
+            metrics['objects_freed'] += freed
+            metrics['bytes_reclaimed'] += bytes_reclaimed
+            metrics['objects_pending_sweep'] = max(0, metrics['objects_pending_sweep'] - freed)
+            metrics['regions_pending_sweep'] = len(self.pending_regions)
+            elapsed = (time.time() - start_time) * 1000
+            metrics['sweep_time'] = round(metrics['sweep_time'] + elapsed, 3)
+            if 'virtual_sweep_time' in metrics and self.heap.cost_model is not None:
+                virtual = self.heap.cost_model.price({'objects_swept': objects_swept})['virtual_pause']
+                metrics['virtual_sweep_time'] = round(metrics['virtual_sweep_time'] + virtual, 6)
+            if on_allocation:
+                # Only sweeping done inside allocate() is charged to the mutator
+                metrics['allocation_sweep_time'] = round(metrics['allocation_sweep_time'] + elapsed, 3)
+                metrics['amortized_sweep_cost'] = round(
+                    metrics['allocation_sweep_time'] / metrics['sweep_allocations'], 4)
+        
+        if not self.pending_regions and self.heap.sweeper is self:
+            self.heap.sweeper = None
+        return swept
+    
+    def sweep_for_allocation(self, size: int):
+        """Sweep one region per allocation, and more if needed to fit the request"""
+        if self.sweep_metrics is not None:
+            self.sweep_metrics['sweep_allocations'] += 1
+        self.sweep(max_regions=1, min_free=size, on_allocation=True)
+    
+    def finish_sweep(self) -> int:
+        """Sweep every remaining region"""
+        return self.sweep()
+    
+    def on_add_reference(self, from_id: str, to_id: str):
+        """Write barrier while a sweep is pending: whatever a live object now points to must survive it"""
+        blocks = self.heap.blocks
+        if from_id in self.unswept and not blocks[from_id].marked:
+            return  # A reference from garbage keeps nothing alive
+        seen = set()
+        stack = [to_id]
+        while stack:
+            block_id = stack.pop()
+            if block_id in seen or block_id not in blocks:
+                continue
+            seen.add(block_id)
+            block = blocks[block_id]
+            if block_id in self.unswept:
+                if block.marked:
+                    continue  # Marked objects only point at marked or newer objects
+                block.marked = True
+                self.heap.touch(block, HEADER_BYTES)
+                if self.sweep_metrics is not None:
+                    self.sweep_metrics['objects_pending_sweep'] -= 1
+            stack.extend(block.references)
+    
+    def sweep_copy(self, heap: HeapSimulator) -> int:
+        """Finish the pending sweep in a copy of this collector's heap, leaving the original unswept"""
+        sweeper = MarkSweepGC(heap, lazy=True, sweep_chunk=self.sweep_chunk)
+        sweeper.pending_regions = [list(region) for region in self.pending_regions]
+        sweeper.unswept = set(self.unswept)
+        return sweeper.finish_sweep()
@@ -1,5 +1,8 @@
+import bisect
+import copy
 import uuid
-from typing import Dict, List, Set, Optional
+from contextlib import contextmanager
+from typing import Dict, List, Set, Optional, Tuple
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 
@@ -14,6 +17,13 @@ class MemoryBlock:
     references: Set[str] = field(default_factory=set)
     age: int = 0  # Number of GC cycles survived
     root: bool = False  # Is this a root object
+    address: int = 0  # Position in the heap, in blocks
+    site: Optional[str] = None  # Allocation site label
+
+# Fields exposed when blocks are serialized for the API
+BLOCK_FIELDS = ('id', 'size', 'allocated', 'marked', 'generation', 'references', 'age', 'root', 'address', 'site')
+
+HEADER_BYTES = 8  # Bytes a collector reads when it only inspects an object's header
     
 class HeapSimulator:
     """Simulates a memory heap for garbage collection"""
@@ -26,25 +36,61 @@ class HeapSimulator:
         self.roots: Set[str] = set()
         self.free_blocks = self.num_blocks
         self.allocated_blocks = 0
+        self.policy = None  # Optional GCPolicy consulted on allocation
+        self.sweeper = None  # Collector with regions left to sweep lazily
+        self.version = 0  # Bumped on every change to the object graph
+        self.reachability = None  # Optional ReachabilityIndex kept in sync with mutations
+        self.cost_model = None  # Optional CostModel for deterministic virtual pauses
+        self.sites = None  # Optional AllocationSiteTracker deciding which sites are pretenured
+        self.history = None  # Optional HeapHistory checkpointed around every recorded collection
+        self.next_address = 0  # Bump pointer, in blocks
+        self.holes: List[List[int]] = []  # Sorted [address, length] gaps left by freed objects
+        self.access_trace: Optional[List[Tuple[int, int]]] = None  # (byte address, bytes) when recording
         
-    def allocate(self, size: int = 1, root: bool = False) -> Optional[str]:
+    def allocate(self, size: int = 1, root: bool = False, site: Optional[str] = None) -> Optional[str]:
         """Allocate memory blocks"""
+        if self.sweeper is not None:
+            self.sweeper.sweep_for_allocation(size)
+            
+        if self.policy is not None:
+            self.policy.before_allocation(size)
+            
         if self.free_blocks < size:
-            return None
+            if self.policy is None or not self.policy.on_allocation_failure(size):
+                return None
             
+        generation = 0
+        if site is not None and self.sites is not None:
+            generation = self.sites.generation_for(site)
+        
         block_id = str(uuid.uuid4())[:8]
+        while block_id in self.blocks:  # Short ids collide on large heaps
+            block_id = str(uuid.uuid4())[:8]
         block = MemoryBlock(
             id=block_id,
             size=size,
             allocated=True,
-            root=root
+            root=root,
+            address=self._place(size),
+            generation=generation,
+            site=site
         )
         self.blocks[block_id] = block
         self.free_blocks -= size
         self.allocated_blocks += size
+        self.version += 1
         
         if root:
             self.roots.add(block_id)
+        
+        if generation == 1:
+            self.sites.on_allocate(block_id, site)
+            
+        if self.reachability is not None:
+            self.reachability.on_allocate(block_id)
+            
+        if self.policy is not None:
+            self.policy.after_allocation(size)
             
         return block_id
     
@@ -59,14 +105,20 @@ class HeapSimulator:
             
         self.free_blocks += block.size
         self.allocated_blocks -= block.size
+        self._release(block.address, block.size)
         
         # Remove from roots if present
         if block_id in self.roots:
             self.roots.remove(block_id)
             
         # Remove all references
+        references = set(block.references) if self.reachability is not None else None
         block.references.clear()
         del self.blocks[block_id]
+        self.version += 1
+        
+        if self.reachability is not None:
+            self.reachability.on_deallocate(block_id, references)
         
         return True
     
@@ -76,6 +128,11 @@ class HeapSimulator:
             return False
             
         self.blocks[from_id].references.add(to_id)
+        self.version += 1
+        if self.sweeper is not None:
+            self.sweeper.on_add_reference(from_id, to_id)
+        if self.reachability is not None:
+            self.reachability.on_add_reference(from_id, to_id)
         return True
     
     def remove_reference(self, from_id: str, to_id: str) -> bool:
@@ -85,9 +142,115 @@ class HeapSimulator:
             
         if to_id in self.blocks[from_id].references:
             self.blocks[from_id].references.remove(to_id)
+            self.version += 1
+            if self.reachability is not None:
+                self.reachability.on_remove_reference(from_id, to_id)
             return True
         return False
     
+    def _place(self, size: int, avoid: List[Tuple[int, int]] = ()) -> int:
+        """First-fit address outside the sorted ``avoid`` ranges, bumping past the end if no hole fits"""
+        for i, (address, length) in enumerate(self.holes):
+            if length >= size:
+                start = self._skip(address, size, avoid)
+                if start + size <= address + length:
+                    # Keep whatever is left of the hole on either side of the object
+                    self.holes[i:i + 1] = [
+                        hole for hole in ([address, start - address], [start + size, address + length - start - size])
+                        if hole[1] > 0
+                    ]
+                    return start
+        start = self._skip(self.next_address, size, avoid)
+        if start > self.next_address:
+            self.holes.append([self.next_address, start - self.next_address])
+        self.next_address = start + size
+        return start
+    
+    @staticmethod
+    def _skip(address: int, size: int, avoid: List[Tuple[int, int]]) -> int:
+        """First address from ``address`` on where ``size`` blocks overlap none of the ``avoid`` ranges"""
+        for begin, end in avoid:
+            if address + size <= begin:
+                break
+            if end > address:
+                address = end
+        return address
+    
+    def _release(self, address: int, size: int):
+        """Return an object's address range, coalescing with neighbouring holes"""
+        i = bisect.bisect_left(self.holes, [address, 0])
+        if i < len(self.holes) and self.holes[i][0] == address + size:
+            size += self.holes[i][1]
+            del self.holes[i]
+        if i > 0 and self.holes[i - 1][0] + self.holes[i - 1][1] == address:
+            address = self.holes[i - 1][0]
+            size += self.holes[i - 1][1]
+            del self.holes[i - 1]
+            i -= 1
+        if address + size == self.next_address:
+            self.next_address = address
+        else:
+            self.holes.insert(i, [address, size])
+    
+    def relocate(self, block: MemoryBlock, avoid: List[Tuple[int, int]] = ()) -> int:
+        """Move an object to the first free address outside the sorted ``avoid`` ranges (start, end)"""
+        address = self._place(block.size, avoid)
+        self._release(block.address, block.size)
+        block.address = address
+        return address
+    
+    def touch(self, block: MemoryBlock, nbytes: Optional[int] = None):
+        """Record a memory access to a block while an access trace is being collected"""
+        if self.access_trace is not None:
+            self.access_trace.append((
+                block.address * self.block_size,
+                block.size * self.block_size if nbytes is None else nbytes
+            ))
+    
+    def clone(self) -> 'HeapSimulator':
+        """Independent copy of the heap contents, without attached policy or index"""
+        clone = copy.copy(self)
+        clone.blocks = {}
+        for block_id, block in self.blocks.items():
+            block_copy = copy.copy(block)
+            block_copy.references = set(block.references)
+            clone.blocks[block_id] = block_copy
+        clone.roots = set(self.roots)
+        clone.holes = [list(hole) for hole in self.holes]
+        clone.policy = None
+        clone.sweeper = None
+        clone.reachability = None
+        clone.sites = None
+        clone.history = None
+        clone.access_trace = None
+        if self.sweeper is not None:
+            # Sweep the copy: reading the heap must not advance the source's lazy sweep
+            self.sweeper.sweep_copy(clone)
+        return clone
+    
+    @contextmanager
+    def allocation_batch(self):
+        """Defer policy-triggered collections while a batch of objects is allocated and linked"""
+        policy = self.policy
+        if policy is not None:
+            policy.begin_batch()
+        try:
+            yield
+        finally:
+            if policy is not None:
+                policy.end_batch()
+    
+    def finish_pending_sweep(self):
+        """Sweep whatever a lazy collector left unswept"""
+        if self.sweeper is not None:
+            self.sweeper.finish_sweep()
+    
+    def grow(self, extra_blocks: int):
+        """Grow the heap by a number of blocks"""
+        self.num_blocks += extra_blocks
+        self.total_size = self.num_blocks * self.block_size
+        self.free_blocks += extra_blocks
+    
     def get_stats(self) -> Dict:
         """Get current heap statistics"""
         total_allocated = sum(b.size for b in self.blocks.values() if b.allocated)
@@ -112,13 +275,21 @@ class HeapSimulator:
         """Reset the heap"""
         self.blocks.clear()
         self.roots.clear()
+        self.sweeper = None
+        if self.sites is not None:
+            self.sites.forget_objects()
+        if self.history is not None:
+            self.history.clear()
+        self.version += 1
+        self.next_address = 0
+        self.holes = []
         self.free_blocks = self.num_blocks
         self.allocated_blocks = 0
     
-    def get_all_blocks(self) -> List[Dict]:
-        """Get all blocks as dict"""
-        return [
-            {
+    def block_to_dict(self, block: MemoryBlock, fields=BLOCK_FIELDS) -> Dict:
+        """Serialize a block, keeping only the requested fields"""
+        if fields is BLOCK_FIELDS:
+            return {
                 'id': block.id,
                 'size': block.size,
                 'allocated': block.allocated,
@@ -126,7 +297,41 @@ class HeapSimulator:
                 'generation': block.generation,
                 'references': list(block.references),
                 'age': block.age,
-                'root': block.root
+                'root': block.root,
+                'address': block.address,
+                'site': block.site
             }
-            for block in self.blocks.values()
+        
+        data = {}
+        for name in fields:
+            value = getattr(block, name)
+            data[name] = list(value) if name == 'references' else value
+        return data
+    
+    def query_blocks(self, offset: int = 0, limit: Optional[int] = None,
+                     generation: Optional[int] = None, root: Optional[bool] = None,
+                     min_age: Optional[int] = None, max_age: Optional[int] = None,
+                     min_size: Optional[int] = None, max_size: Optional[int] = None,
+                     fields=BLOCK_FIELDS) -> Tuple[int, List[Dict]]:
+        """Filter, paginate and project blocks; returns (total matches, page)"""
+        unknown = [name for name in fields if name not in BLOCK_FIELDS]
+        if unknown:
+            raise ValueError(f"Unknown block fields: {', '.join(unknown)}")
+        
+        matches = [
+            block for block in self.blocks.values()
+            if (generation is None or block.generation == generation)
+            and (root is None or block.root == root)
+            and (min_age is None or block.age >= min_age)
+            and (max_age is None or block.age <= max_age)
+            and (min_size is None or block.size >= min_size)
+            and (max_size is None or block.size <= max_size)
         ]
+
+        end = len(matches) if limit is None else offset + limit
+        page = [self.block_to_dict(block, fields) for block in matches[offset:end]]
+        return len(matches), page
+    
+    def get_all_blocks(self) -> List[Dict]:
+        """Get all blocks as dict"""
+        return [self.block_to_dict(block) for block in self.blocks.values()]
@@ -1,6 +1,14 @@
 from typing import List, Dict
 from datetime import datetime, timezone
 import json
+import math
+
+def percentile(values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of a sorted list"""
+    if not values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(values)))
+    return values[rank - 1]
 
 class MetricsTracker:
     """Track and aggregate GC metrics"""
@@ -8,15 +16,27 @@ class MetricsTracker:
     def __init__(self):
         self.cycles: List[Dict] = []
         self.current_cycle = 0
+        self.policy_decisions: List[Dict] = []
         
     def record_cycle(self, metrics: Dict):
         """Record a GC cycle"""
         self.current_cycle += 1
-        cycle_data = {
-            'cycle_id': self.current_cycle,
-            **metrics
-        }
-        self.cycles.append(cycle_data)
+        # Stored by reference so collectors that finish work after the pause
+        # (e.g. lazy sweeping) can keep updating the cycle they started
+        metrics['cycle_id'] = self.current_cycle
+        self.cycles.append(metrics)
+        
+    def record_policy_decision(self, decision: Dict):
+        """Record a decision taken by the GC policy"""
+        self.policy_decisions.append({
+            'decision_id': len(self.policy_decisions) + 1,
+            'after_cycle': self.current_cycle,
+            **decision
+        })
+        
+    def get_policy_decisions(self) -> List[Dict]:
+        """Get all recorded policy decisions"""
+        return self.policy_decisions
         
     def get_all_cycles(self) -> List[Dict]:
         """Get all recorded cycles"""
@@ -37,8 +57,9 @@ class MetricsTracker:
         total_freed = sum(c.get('objects_freed', 0) for c in self.cycles)
         total_bytes = sum(c.get('bytes_reclaimed', 0) for c in self.cycles)
         pause_durations = [c.get('pause_duration', 0) for c in self.cycles]
+        virtual_pauses = [c['virtual_pause'] for c in self.cycles if 'virtual_pause' in c]
         
-        return {
+        summary = {
             'total_cycles': len(self.cycles),
             'total_objects_freed': total_freed,
             'total_bytes_reclaimed': total_bytes,
@@ -46,6 +67,11 @@ class MetricsTracker:
             'max_pause_duration': round(max(pause_durations), 3) if pause_durations else 0,
             'min_pause_duration': round(min(pause_durations), 3) if pause_durations else 0
         }
+        if virtual_pauses:
+            summary['avg_virtual_pause'] = round(sum(virtual_pauses) / len(virtual_pauses), 6)
+            summary['max_virtual_pause'] = round(max(virtual_pauses), 6)
+            summary['total_virtual_pause'] = round(sum(virtual_pauses), 6)
+        return summary
     
     def get_algorithm_comparison(self) -> Dict:
         """Compare metrics across different algorithms"""
@@ -58,13 +84,16 @@ class MetricsTracker:
                     'cycles': 0,
                     'total_freed': 0,
                     'total_bytes': 0,
-                    'pause_times': []
+                    'pause_times': [],
+                    'virtual_pauses': []
                 }
             
             algorithms[algo]['cycles'] += 1
             algorithms[algo]['total_freed'] += cycle.get('objects_freed', 0)
             algorithms[algo]['total_bytes'] += cycle.get('bytes_reclaimed', 0)
             algorithms[algo]['pause_times'].append(cycle.get('pause_duration', 0))
+            if 'virtual_pause' in cycle:
+                algorithms[algo]['virtual_pauses'].append(cycle['virtual_pause'])
         
         # Calculate averages
         comparison = {}
@@ -78,6 +107,10 @@ class MetricsTracker:
                 'max_pause_duration': round(max(data['pause_times']), 3) if data['pause_times'] else 0,
                 'throughput': round(data['total_freed'] / data['cycles'], 2) if data['cycles'] > 0 else 0
             }
+            if data['virtual_pauses']:
+                comparison[algo]['avg_virtual_pause'] = round(
+                    sum(data['virtual_pauses']) / len(data['virtual_pauses']), 6)
+                comparison[algo]['max_virtual_pause'] = round(max(data['virtual_pauses']), 6)
         
         return comparison
     
@@ -85,6 +118,7 @@ class MetricsTracker:
         """Reset all metrics"""
         self.cycles.clear()
         self.current_cycle = 0
+        self.policy_decisions.clear()
     
     def export_csv(self) -> str:
         """Export metrics as CSV string"""
@@ -92,7 +126,7 @@ class MetricsTracker:
             return ""
         
         headers = ['cycle_id', 'algorithm', 'timestamp', 'objects_scanned', 'objects_freed', 
-                   'bytes_reclaimed', 'pause_duration']
+                   'bytes_reclaimed', 'pause_duration', 'trigger', 'virtual_pause']
         
         csv_lines = [','.join(headers)]
         
@@ -104,7 +138,9 @@ class MetricsTracker:
                 str(cycle.get('objects_scanned', 0)),
                 str(cycle.get('objects_freed', 0)),
                 str(cycle.get('bytes_reclaimed', 0)),
-                str(cycle.get('pause_duration', 0))
+                str(cycle.get('pause_duration', 0)),
+                cycle.get('trigger', 'manual'),
+                str(cycle.get('virtual_pause', ''))
             ]
             csv_lines.append(','.join(row))
         
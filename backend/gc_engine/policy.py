@@ -0,0 +1,265 @@
+from typing import Dict, Optional
+from .memory import HeapSimulator
+from .metrics import MetricsTracker
+from datetime import datetime, timezone
+
+class GCPolicy:
+    """Decides when to collect, which generation to collect and how to tune the heap.
+
+    Once attached to a heap, the policy is consulted by ``HeapSimulator.allocate``:
+    it runs a collection when an allocation would push occupancy past the
+    threshold or when the heap has no room left, and afterwards adapts the
+    collector's promotion age and the heap size to the observed behaviour.
+    """
+
+    def __init__(self, heap: HeapSimulator, gc, metrics: MetricsTracker,
+                 occupancy_threshold: float = 0.8,
+                 adaptive: bool = True,
+                 growth_factor: float = 1.5,
+                 max_total_size: Optional[int] = None,
+                 major_survival_threshold: float = 0.7,
+                 min_promotion_age: int = 1,
+                 max_promotion_age: int = 8):
+        self.heap = heap
+        self.gc = gc
+        self.metrics = metrics
+        self.occupancy_threshold = occupancy_threshold
+        self.adaptive = adaptive
+        self.growth_factor = growth_factor
+        self.max_total_size = max_total_size if max_total_size is not None else heap.total_size * 4
+        self.major_survival_threshold = major_survival_threshold
+        self.min_promotion_age = min_promotion_age
+        self.max_promotion_age = max_promotion_age
+
+        self.allocations_since_gc = 0  # Blocks allocated since the last collection
+        self.requested_since_gc = 0    # Blocks requested since the last collection, including failed requests
+        self.backoff_blocks = 0        # Requests to wait for before retrying a collection that left the heap full
+        self.allocation_rate = 0.0     # Smoothed fraction of the heap allocated per cycle
+        self.young_survival_rate = 0.0 # Smoothed fraction of young objects surviving a minor GC
+        self.collections_triggered = 0
+        self._collecting = False
+        self._batch_depth = 0  # Open allocation batches; collections wait until they end
+
+    def attach(self):
+        """Install this policy on its heap"""
+        self.heap.policy = self
+
+    def detach(self):
+        """Remove this policy from its heap"""
+        if self.heap.policy is self:
+            self.heap.policy = None
+
+    def occupancy(self, extra_blocks: int = 0) -> float:
+        """Fraction of the heap in use, optionally counting a pending allocation"""
+        if self.heap.num_blocks == 0:
+            return 1.0
+        return (self.heap.allocated_blocks + extra_blocks) / self.heap.num_blocks
+
+    def begin_batch(self):
+        """Hold off collections while objects are allocated but not yet linked to anything"""
+        self._batch_depth += 1
+
+    def end_batch(self):
+        """Close a batch and run the collection it held off, if one is due"""
+        self._batch_depth -= 1
+        if self._batch_depth == 0 and not self._collecting and self._may_collect() \
+                and self.occupancy() > self.occupancy_threshold:
+            self.collect('occupancy-threshold')
+
+    def _may_collect(self) -> bool:
+        """Whether enough has been requested since the last cycle for another one to help"""
+        return self.allocations_since_gc > 0 and self.requested_since_gc >= self.backoff_blocks
+
+    def before_allocation(self, size: int):
+        """Called by the heap before it tries to satisfy an allocation"""
+        self.requested_since_gc += size
+        if self._collecting or self._batch_depth or not self._may_collect():
+            # Nothing allocated since the last cycle, or backing off after a cycle that left the heap full
+            return
+        if self.occupancy(size) > self.occupancy_threshold:
+            self.collect('occupancy-threshold', size)
+
+    def on_allocation_failure(self, size: int) -> bool:
+        """Called by the heap when an allocation does not fit; returns True if it now does"""
+        if self._collecting:
+            return False
+        if self._batch_depth:
+            # Collecting now could free the batch's unlinked objects; only grow the heap
+            self._grow_heap(size, 'allocation-failure')
+            return self.heap.free_blocks >= size
+        if self.requested_since_gc < self.backoff_blocks:
+            return False
+        self.collect('allocation-failure', size)
+
+        # A collection that could not make room means the live set has outgrown the heap
+        if self.heap.free_blocks < size:
+            self._grow_heap(size, 'allocation-failure')
+
+        return self.heap.free_blocks >= size
+
+    def after_allocation(self, size: int):
+        """Called by the heap after a successful allocation"""
+        self.allocations_since_gc += size
+
+    def collect(self, trigger: str, requested: int = 0) -> Dict:
+        """Run a policy-triggered collection and record it"""
+        self._collecting = True
+        if self.heap.history is not None:
+            self.heap.history.capture_before()
+        try:
+            metrics = self._run_collector(requested)
+        finally:
+            self._collecting = False
+
+        metrics['trigger'] = trigger
+        self.metrics.record_cycle(metrics)
+        if self.heap.history is not None:
+            self.heap.history.capture_after(metrics['cycle_id'])
+        self.collections_triggered += 1
+
+        self._log_decision('collect', trigger, {
+            'algorithm': metrics.get('algorithm'),
+            'collection_type': metrics.get('collection_type'),
+            'requested_blocks': requested,
+            'objects_freed': metrics.get('objects_freed', 0),
+            'cycle_id': self.metrics.current_cycle
+        })
+
+        if self.adaptive:
+            self._adapt(trigger)
+
+        if self.occupancy() > self.occupancy_threshold:
+            # The live set fills the heap: wait for more requests (twice as many each time) before retrying
+            self.backoff_blocks = min(max(2 * self.backoff_blocks, self.heap.num_blocks // 16, 1), self.heap.num_blocks)
+        else:
+            self.backoff_blocks = 0
+        self.allocations_since_gc = 0
+        self.requested_since_gc = 0
+        return metrics
+
+    def choose_minor_only(self) -> bool:
+        """Pick a minor or major collection for a generational collector"""
+        young = sum(1 for b in self.heap.blocks.values() if b.generation == 0)
+        old = len(self.heap.blocks) - young
+
+        if self.young_survival_rate >= self.major_survival_threshold:
+            reason = 'high-young-survival'
+            minor_only = False
+        elif young == 0 and old > 0:
+            reason = 'empty-young-generation'
+            minor_only = False
+        else:
+            reason = 'low-young-survival'
+            minor_only = True
+
+        self._log_decision('generation', reason, {
+            'minor_only': minor_only,
+            'young_objects': young,
+            'old_objects': old,
+            'young_survival_rate': round(self.young_survival_rate, 3)
+        })
+        return minor_only
+
+    def _run_collector(self, requested: int) -> Dict:
+        """Invoke the collector, escalating generational minor GCs when they free too little"""
+        if not hasattr(self.gc, 'promotion_age'):
+            return self.gc.collect()
+
+        minor_only = self.choose_minor_only()
+        young_before = sum(1 for b in self.heap.blocks.values() if b.generation == 0)
+        metrics = self.gc.collect(minor_only=minor_only)
+
+        if minor_only and young_before > 0:
+            survival = 1 - metrics.get('objects_freed', 0) / young_before
+            self.young_survival_rate = 0.5 * self.young_survival_rate + 0.5 * survival
+
+        if minor_only and requested and self.heap.free_blocks < requested:
+            self._log_decision('generation', 'minor-insufficient', {
+                'minor_only': False,
+                'free_blocks': self.heap.free_blocks,
+                'requested_blocks': requested
+            })
+            major = self.gc.collect(minor_only=False)
+            metrics['collection_type'] = major['collection_type']
+            metrics['objects_freed'] += major['objects_freed']
+            metrics['bytes_reclaimed'] += major['bytes_reclaimed']
+            metrics['pause_duration'] = round(metrics['pause_duration'] + major['pause_duration'], 3)
+            if 'virtual_pause' in metrics and 'virtual_pause' in major:
+                metrics['virtual_work'] = round(metrics['virtual_work'] + major['virtual_work'], 3)
+                metrics['virtual_pause'] = round(metrics['virtual_pause'] + major['virtual_pause'], 6)
+                metrics['work'] = {k: metrics['work'][k] + major['work'][k] for k in metrics['work']}
+
+        return metrics
+
+    def _adapt(self, trigger: str):
+        """Tune promotion age and heap size from the last cycle"""
+        rate = self.allocations_since_gc / self.heap.num_blocks if self.heap.num_blocks else 0.0
+        self.allocation_rate = 0.5 * self.allocation_rate + 0.5 * rate
+
+        if hasattr(self.gc, 'promotion_age'):
+            old_age = self.gc.promotion_age
+            new_age = old_age
+            if self.young_survival_rate >= self.major_survival_threshold:
+                # Survivors are long-lived anyway; stop copying them around the nursery
+                new_age = max(self.min_promotion_age, old_age - 1)
+            elif self.young_survival_rate < 1 - self.major_survival_threshold:
+                # Most young objects die; give them more time before tenuring
+                new_age = min(self.max_promotion_age, old_age + 1)
+
+            if new_age != old_age:
+                self.gc.promotion_age = new_age
+                self._log_decision('promotion-age', trigger, {
+                    'old_promotion_age': old_age,
+                    'new_promotion_age': new_age,
+                    'young_survival_rate': round(self.young_survival_rate, 3)
+                })
+
+        # Still above the threshold right after a collection, or allocating faster than
+        # the headroom left: grow the heap so the next cycle is not immediately triggered
+        headroom = 1 - self.occupancy()
+        if self.occupancy() > self.occupancy_threshold or self.allocation_rate > headroom:
+            self._grow_heap(0, 'allocation-rate')
+
+    def _grow_heap(self, requested: int, reason: str) -> bool:
+        """Grow the heap by the growth factor, bounded by max_total_size"""
+        target_blocks = max(int(self.heap.num_blocks * self.growth_factor),
+                            self.heap.allocated_blocks + requested)
+        max_blocks = self.max_total_size // self.heap.block_size
+        target_blocks = min(target_blocks, max_blocks)
+        extra = target_blocks - self.heap.num_blocks
+        if extra <= 0:
+            return False
+
+        old_size = self.heap.total_size
+        self.heap.grow(extra)
+        self._log_decision('grow-heap', reason, {
+            'old_total_size': old_size,
+            'new_total_size': self.heap.total_size,
+            'allocation_rate': round(self.allocation_rate, 3)
+        })
+        return True
+
+    def _log_decision(self, action: str, reason: str, details: Dict):
+        """Record a policy decision in the metrics tracker"""
+        self.metrics.record_policy_decision({
+            'action': action,
+            'reason': reason,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            **details
+        })
+
+    def get_state(self) -> Dict:
+        """Get the policy configuration and learned state"""
+        return {
+            'algorithm': getattr(self.gc, 'name', None),
+            'occupancy_threshold': self.occupancy_threshold,
+            'adaptive': self.adaptive,
+            'growth_factor': self.growth_factor,
+            'max_total_size': self.max_total_size,
+            'promotion_age': getattr(self.gc, 'promotion_age', None),
+            'occupancy': round(self.occupancy(), 3),
+            'allocation_rate': round(self.allocation_rate, 3),
+            'young_survival_rate': round(self.young_survival_rate, 3),
+            'collections_triggered': self.collections_triggered,
+            'backoff_blocks': self.backoff_blocks
+        }
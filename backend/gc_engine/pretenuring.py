@@ -0,0 +1,132 @@
+from typing import Dict, List, Optional, Tuple
+
+class AllocationSiteTracker:
+    """Per-allocation-site survival statistics and pretenuring decisions.
+    
+    Young objects are sampled at their first minor collection: a site whose
+    objects mostly survive it is switched to allocate straight into the old
+    generation. Objects allocated that way are followed until they would have
+    been promoted, which gives the young-generation work avoided; a pretenured
+    site is switched back if too many of its old objects die early.
+    """
+    
+    def __init__(self, survival_threshold: float = 0.8, min_samples: int = 20):
+        self.survival_threshold = survival_threshold
+        self.min_samples = min_samples
+        self.sites: Dict[str, Dict] = {}
+        self.pretenured_sites = set()
+        self.pretenured: Dict[str, Tuple[str, int]] = {}  # block id -> (site, collections survived so far)
+        self.allocated_since_gc = 0  # Objects pretenured since the last collection
+    
+    def _site(self, site: str) -> Dict:
+        """Stats entry for a site, created on first use"""
+        stats = self.sites.get(site)
+        if stats is None:
+            stats = self.sites[site] = {
+                'allocations': 0,
+                'pretenured': 0,
+                'survived': 0,
+                'died': 0,
+                'pretenured_died': 0
+            }
+        return stats
+    
+    def generation_for(self, site: str) -> int:
+        """Generation a new object from a site is allocated in"""
+        stats = self._site(site)
+        stats['allocations'] += 1
+        if site in self.pretenured_sites:
+            stats['pretenured'] += 1
+            return 1
+        return 0
+    
+    def on_allocate(self, block_id: str, site: str):
+        """Start following an object allocated directly into the old generation"""
+        self.pretenured[block_id] = (site, 0)
+        self.allocated_since_gc += 1
+    
+    def record_survival(self, site: str, survived: bool):
+        """Record whether a young object survived its first minor collection"""
+        stats = self._site(site)
+        stats['survived' if survived else 'died'] += 1
+    
+    def survival_rate(self, site: str) -> Optional[float]:
+        """Fraction of sampled young objects from a site that survived, if sampled enough"""
+        stats = self.sites.get(site)
+        if stats is None:
+            return None
+        samples = stats['survived'] + stats['died']
+        if samples < self.min_samples:
+            return None
+        return stats['survived'] / samples
+    
+    def after_collection(self, blocks: Dict, promotion_age: int) -> Dict:
+        """Account for young-generation work pretenured objects avoided, given the collector's current promotion age"""
+        scans_avoided = 0
+        promotions_avoided = 0
+        blocks_avoided = 0
+        for block_id, (site, survived) in list(self.pretenured.items()):
+            block = blocks.get(block_id)
+            if block is None:
+                # Died before it would have left the young generation: pretenuring guessed wrong
+                if site in self.pretenured_sites:
+                    self._site(site)['pretenured_died'] += 1
+                del self.pretenured[block_id]
+                continue
+            scans_avoided += 1
+            if survived + 1 >= promotion_age:
+                promotions_avoided += 1
+                blocks_avoided += block.size
+                del self.pretenured[block_id]
+            else:
+                self.pretenured[block_id] = (site, survived + 1)
+        
+        changes = self.update_decisions()
+        savings = {
+            'objects_pretenured': self.allocated_since_gc,
+            'young_scans_avoided': scans_avoided,
+            'promotions_avoided': promotions_avoided,
+            'blocks_not_promoted': blocks_avoided,
+            'pretenured_sites': sorted(self.pretenured_sites),
+            'decisions': changes
+        }
+        self.allocated_since_gc = 0
+        return savings
+    
+    def forget_objects(self):
+        """Stop following objects, e.g. after the heap was reset; site statistics are kept"""
+        self.pretenured.clear()
+        self.allocated_since_gc = 0
+    
+    def update_decisions(self) -> List[Dict]:
+        """Pretenure sites whose objects survive, and stop for sites whose pretenured objects die"""
+        changes = []
+        for site, stats in self.sites.items():
+            if site not in self.pretenured_sites:
+                rate = self.survival_rate(site)
+                if rate is not None and rate >= self.survival_threshold:
+                    self.pretenured_sites.add(site)
+                    changes.append({'site': site, 'pretenure': True, 'survival_rate': round(rate, 3)})
+            elif stats['pretenured'] >= self.min_samples:
+                died = stats['pretenured_died'] / stats['pretenured']
+                if died > 1 - self.survival_threshold:
+                    self.pretenured_sites.discard(site)
+                    # Sample the site afresh in the young generation before deciding again
+                    stats.update({'pretenured': 0, 'survived': 0, 'died': 0, 'pretenured_died': 0})
+                    changes.append({'site': site, 'pretenure': False, 'pretenured_died_rate': round(died, 3)})
+        return changes
+    
+    def get_stats(self) -> Dict:
+        """Per-site statistics and current decisions"""
+        return {
+            'survival_threshold': self.survival_threshold,
+            'min_samples': self.min_samples,
+            'sites': {
+                site: {
+                    **stats,
+                    'survival_rate': None if self.survival_rate(site) is None else round(self.survival_rate(site), 3),
+                    'pretenured_now': site in self.pretenured_sites
+                }
+                for site, stats in sorted(self.sites.items())
+            }
+        }
@@ -0,0 +1,190 @@
+from typing import Dict, Iterable, Set
+from .memory import HeapSimulator
+
+class ReachabilityIndex:
+    """Live set kept up to date as the heap is mutated.
+    
+    Additions only ever grow the live set, so ``add_reference`` and ``allocate``
+    propagate liveness from the new edge. Deletions re-verify the objects
+    reachable from the lost edge: any of them with a live referrer outside that
+    region is still supported, the rest become garbage. If the region grows past
+    ``max_recheck`` objects, or the heap was changed behind the index's back
+    (e.g. a copying collection), the index is rebuilt on the next query.
+    """
+    
+    def __init__(self, heap: HeapSimulator, max_recheck: int = 1000):
+        self.heap = heap
+        self.max_recheck = max_recheck
+        self.live: Set[str] = set()
+        self.unreachable: Set[str] = set()
+        self.referrers: Dict[str, Set[str]] = {}
+        self.synced_version = -1
+        self.dirty = True
+        self.stats = {
+            'incremental_updates': 0,
+            'full_rebuilds': 0,
+            'rechecked_objects': 0,
+            'recheck_overflows': 0
+        }
+    
+    def attach(self):
+        """Install this index on its heap"""
+        self.heap.reachability = self
+        self.rebuild()
+    
+    def detach(self):
+        """Remove this index from its heap"""
+        if self.heap.reachability is self:
+            self.heap.reachability = None
+    
+    def rebuild(self):
+        """Recompute referrers and the live set from scratch"""
+        blocks = self.heap.blocks
+        self.referrers = {block_id: set() for block_id in blocks}
+        for block_id, block in blocks.items():
+            for ref_id in block.references:
+                if ref_id in self.referrers:
+                    self.referrers[ref_id].add(block_id)
+        
+        self.live = set()
+        self._propagate(root_id for root_id in self.heap.roots if root_id in blocks)
+        self.unreachable = set(blocks) - self.live
+        
+        self.synced_version = self.heap.version
+        self.dirty = False
+        self.stats['full_rebuilds'] += 1
+    
+    def _propagate(self, starts: Iterable[str]):
+        """Mark everything reachable from starts as live"""
+        blocks = self.heap.blocks
+        stack = [block_id for block_id in starts if block_id not in self.live]
+        while stack:
+            block_id = stack.pop()
+            if block_id in self.live:
+                continue
+            self.live.add(block_id)
+            self.unreachable.discard(block_id)
+            for ref_id in blocks[block_id].references:
+                if ref_id in blocks and ref_id not in self.live:
+                    stack.append(ref_id)
+    
+    def _reverify(self, starts: Iterable[str]):
+        """Re-check liveness of objects that may have lost their only path from the roots"""
+        blocks = self.heap.blocks
+        roots = self.heap.roots
+        region: Set[str] = set()
+        stack = [block_id for block_id in starts if block_id in self.live and block_id not in roots]
+        while stack:
+            block_id = stack.pop()
+            if block_id in region:
+                continue
+            region.add(block_id)
+            if len(region) > self.max_recheck:
+                self.dirty = True
+                self.stats['recheck_overflows'] += 1
+                return
+            for ref_id in blocks[block_id].references:
+                if ref_id in self.live and ref_id not in region and ref_id not in roots:
+                    stack.append(ref_id)
+        self.stats['rechecked_objects'] += len(region)
+        
+        # Roots and live objects outside the region are unaffected by the deletion
+        supported = {
+            block_id for block_id in region
+            if any(ref in self.live and ref not in region for ref in self.referrers.get(block_id, ()))
+        }
+        stack = list(supported)
+        while stack:
+            block_id = stack.pop()
+            for ref_id in blocks[block_id].references:
+                if ref_id in region and ref_id not in supported:
+                    supported.add(ref_id)
+                    stack.append(ref_id)
+        
+        dead = region - supported
+        self.live -= dead
+        self.unreachable |= dead
+    
+    def _begin_update(self) -> bool:
+        """Check that exactly one heap change happened since the last sync"""
+        if self.dirty or self.synced_version != self.heap.version - 1:
+            self.dirty = True
+            return False
+        self.stats['incremental_updates'] += 1
+        return True
+    
+    def _end_update(self):
+        """Record that the index reflects the current heap version"""
+        if not self.dirty:
+            self.synced_version = self.heap.version
+    
+    def on_allocate(self, block_id: str):
+        """A new block is live only if it is a root"""
+        if not self._begin_update():
+            return
+        self.referrers[block_id] = set()
+        if block_id in self.heap.roots:
+            self.live.add(block_id)
+        else:
+            self.unreachable.add(block_id)
+        self._end_update()
+    
+    def on_add_reference(self, from_id: str, to_id: str):
+        """A new edge from a live object makes its target subgraph live"""
+        if not self._begin_update():
+            return
+        self.referrers.setdefault(to_id, set()).add(from_id)
+        if from_id in self.live and to_id not in self.live:
+            self._propagate([to_id])
+        self._end_update()
+    
+    def on_remove_reference(self, from_id: str, to_id: str):
+        """A removed edge between live objects may orphan its target subgraph"""
+        if not self._begin_update():
+            return
+        if to_id in self.referrers:
+            self.referrers[to_id].discard(from_id)
+        if from_id in self.live and to_id in self.live:
+            self._reverify([to_id])
+        self._end_update()
+    
+    def on_deallocate(self, block_id: str, references: Set[str]):
+        """Called after a block is removed, with the references it held"""
+        if not self._begin_update():
+            return
+        was_live = block_id in self.live
+        self.live.discard(block_id)
+        self.unreachable.discard(block_id)
+        self.referrers.pop(block_id, None)
+        for ref_id in references:
+            if ref_id in self.referrers:
+                self.referrers[ref_id].discard(block_id)
+        # Freeing garbage cannot affect anything live; freeing a live object can
+        if was_live:
+            self._reverify(references)
+        self._end_update()
+    
+    def _ensure_fresh(self):
+        """Rebuild if incremental maintenance was abandoned or bypassed"""
+        if self.dirty or self.synced_version != self.heap.version:
+            self.rebuild()
+    
+    def live_set(self) -> Set[str]:
+        """Objects reachable from the roots (do not mutate)"""
+        self._ensure_fresh()
+        return self.live
+    
+    def garbage_set(self) -> Set[str]:
+        """Objects a full collection would free (do not mutate)"""
+        self._ensure_fresh()
+        return self.unreachable
+    
+    def get_stats(self) -> Dict:
+        """Get index size and maintenance counters"""
+        return {
+            'live_objects': len(self.live),
+            'unreachable_objects': len(self.unreachable),
+            'max_recheck': self.max_recheck,
+            'dirty': self.dirty or self.synced_version != self.heap.version,
+            **self.stats
+        }
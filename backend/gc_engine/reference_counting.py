@@ -1,5 +1,5 @@
 from typing import Dict, List, Set
-from .memory import HeapSimulator
+from .memory import HeapSimulator, HEADER_BYTES
 from datetime import datetime, timezone
 import time
 
@@ -26,6 +26,7 @@ class ReferenceCountingGC:
         
         # Count references from other objects
         for block_id, block in self.heap.blocks.items():
+            self.heap.touch(block)
             for ref_id in block.references:
                 if ref_id in self.ref_counts:
                     self.ref_counts[ref_id] += 1
@@ -42,6 +43,7 @@ class ReferenceCountingGC:
                 
             visited.add(block_id)
             rec_stack.add(block_id)
+            self.heap.touch(self.heap.blocks[block_id])
             
             for ref_id in self.heap.blocks[block_id].references:
                 if ref_id not in visited:
@@ -63,10 +65,15 @@ class ReferenceCountingGC:
     
     def collect(self) -> Dict:
         """Run reference counting garbage collection"""
+        self.heap.finish_pending_sweep()
+        
         start_time = time.time()
         
         # Update reference counts
         self._update_ref_counts()
+        if self.heap.cost_model is not None:
+            edges = sum(len(block.references) for block in self.heap.blocks.values())
+            refcount_updates = sum(self.ref_counts.values())
         
         # Detect cycles (objects with ref count > 0 but unreachable)
         cycles = self._detect_cycles()
@@ -87,12 +94,13 @@ class ReferenceCountingGC:
         
         # Update ages
         for block in self.heap.blocks.values():
+            self.heap.touch(block, HEADER_BYTES)
             block.age += 1
         
         end_time = time.time()
         pause_duration = (end_time - start_time) * 1000
         
-        return {
+        metrics = {
             'algorithm': self.name,
             'objects_scanned': len(self.ref_counts),
             'objects_freed': len(blocks_to_remove),
@@ -101,3 +109,14 @@ class ReferenceCountingGC:
             'timestamp': datetime.now(timezone.utc).isoformat(),
             'cycles_detected': len(cycles)
         }
+        if self.heap.cost_model is not None:
+            # Counts are rebuilt (one update per root and per edge), then the cycle
+            # detector visits every object and edge, then every count is checked
+            metrics.update(self.heap.cost_model.price({
+                'roots_scanned': len(self.heap.roots),
+                'refcount_updates': refcount_updates,
+                'objects_marked': len(self.ref_counts),
+                'edges_traced': edges,
+                'objects_swept': len(self.ref_counts)
+            }))
+        return metrics
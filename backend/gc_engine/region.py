@@ -0,0 +1,223 @@
+from typing import Dict, List, Set, Tuple
+from .memory import HeapSimulator, HEADER_BYTES
+from .cost_model import CostModel, WORD_SIZE
+from datetime import datetime, timezone
+import time
+
+class RegionGC:
+    """Region-based (garbage-first) collector with a pause-time target.
+    
+    The heap's address space is split into fixed-size regions. Each cycle marks
+    the live set (the concurrent-marking phase, reported separately as
+    ``mark_time``), builds per-region liveness and remembered sets, and then
+    evacuates, within one pause, the regions with the most garbage whose
+    predicted cost still fits the pause target. Garbage in other regions is
+    left for later cycles.
+    """
+    
+    def __init__(self, heap: HeapSimulator, region_size: int = 16, pause_target: float = 1.0):
+        if region_size <= 0:
+            raise ValueError("Region size must be positive")
+        if pause_target <= 0:
+            raise ValueError("Pause target must be positive")
+        self.heap = heap
+        self.name = "Region (Garbage-First)"
+        self.region_size = region_size  # Region size, in blocks
+        self.pause_target = pause_target  # Target evacuation pause, in ms
+        self.unit_costs = CostModel()  # Relative weights used for pause prediction
+        self.ms_per_unit = self.unit_costs.ms_per_unit  # Learned from measured pauses without a cost model
+    
+    def region_of(self, block) -> int:
+        """Region holding an object's first block"""
+        return block.address // self.region_size
+    
+    def mark(self) -> Set[str]:
+        """Compute the live set from the roots"""
+        if self.heap.reachability is not None:
+            return self.heap.reachability.live_set()
+        
+        blocks = self.heap.blocks
+        live = set()
+        stack = [root_id for root_id in self.heap.roots if root_id in blocks]
+        while stack:
+            block_id = stack.pop()
+            if block_id in live:
+                continue
+            live.add(block_id)
+            block = blocks[block_id]
+            self.heap.touch(block)
+            for ref_id in block.references:
+                if ref_id in blocks and ref_id not in live:
+                    stack.append(ref_id)
+        return live
+    
+    def build_regions(self, live: Set[str]) -> Dict[int, Dict]:
+        """Per-region liveness and remembered sets (objects elsewhere that point into the region)"""
+        regions: Dict[int, Dict] = {}
+        blocks = self.heap.blocks
+        for block_id, block in blocks.items():
+            index = self.region_of(block)
+            region = regions.get(index)
+            if region is None:
+                region = regions[index] = {
+                    'region': index,
+                    'live': [],
+                    'garbage': [],
+                    'live_bytes': 0,
+                    'garbage_bytes': 0,
+                    'live_edges': 0,
+                    'remembered_set': set()
+                }
+            nbytes = block.size * self.heap.block_size
+            if block_id in live:
+                region['live'].append(block_id)
+                region['live_bytes'] += nbytes
+                region['live_edges'] += len(block.references)
+            else:
+                region['garbage'].append(block_id)
+                region['garbage_bytes'] += nbytes
+        
+        # Only live objects keep a region's objects reachable, so only their pointers are remembered
+        for block_id in live:
+            block = blocks[block_id]
+            index = self.region_of(block)
+            for ref_id in block.references:
+                target = blocks.get(ref_id)
+                if target is not None and self.region_of(target) != index:
+                    regions[self.region_of(target)]['remembered_set'].add(block_id)
+        
+        for index, region in regions.items():
+            region['predicted_pause'] = self.predict_pause(region)
+        return regions
+    
+    def _evacuation_work(self, region: Dict) -> Dict[str, int]:
+        """Operations needed to evacuate a region"""
+        roots_in_region = sum(1 for block_id in region['live'] if block_id in self.heap.roots)
+        return {
+            'roots_scanned': roots_in_region + len(region['remembered_set']),
+            'objects_marked': len(region['live']),
+            'edges_traced': region['live_edges'],
+            'words_copied': region['live_bytes'] // WORD_SIZE,
+            'objects_swept': len(region['garbage'])
+        }
+    
+    def predict_pause(self, region: Dict) -> float:
+        """Predicted evacuation pause for a region, in ms"""
+        cost_model = self.heap.cost_model
+        if cost_model is not None:
+            return cost_model.price(self._evacuation_work(region))['virtual_pause']
+        return self.unit_costs.price(self._evacuation_work(region))['virtual_work'] * self.ms_per_unit
+    
+    def select_regions(self, regions: Dict[int, Dict]) -> List[Dict]:
+        """Collection set: regions with the most garbage whose predicted pauses fit the target"""
+        candidates = sorted(
+            (region for region in regions.values() if region['garbage_bytes'] > 0),
+            key=lambda region: (-region['garbage_bytes'], region['region'])
+        )
+        selected = []
+        budget = self.pause_target
+        for region in candidates:
+            # The region with the most garbage is always taken so every cycle makes progress
+            if not selected or region['predicted_pause'] <= budget:
+                selected.append(region)
+                budget -= region['predicted_pause']
+        return selected
+    
+    def evacuate(self, region: Dict, avoid: List[Tuple[int, int]]) -> Dict[str, int]:
+        """Free a region's garbage and copy its live objects out of the ``avoid`` address ranges; returns work done"""
+        blocks = self.heap.blocks
+        for block_id in region['remembered_set']:
+            if block_id in blocks:
+                self.heap.touch(blocks[block_id], HEADER_BYTES)  # Fix up the incoming pointer
+        
+        for block_id in region['garbage']:
+            self.heap.deallocate(block_id)
+        
+        for block_id in region['live']:
+            block = blocks[block_id]
+            self.heap.touch(block)
+            self.heap.relocate(block, avoid)
+            self.heap.touch(block)
+            block.age += 1
+        return self._evacuation_work(region)
+    
+    def occupied_regions(self) -> Set[int]:
+        """Regions that any object's blocks overlap"""
+        size = self.region_size
+        occupied = set()
+        for block in self.heap.blocks.values():
+            occupied.update(range(block.address // size, (block.address + block.size - 1) // size + 1))
+        return occupied
+    
+    def region_stats(self) -> List[Dict]:
+        """Current per-region liveness, without collecting or sweeping"""
+        regions = self.build_regions(self.mark())
+        return [
+            {
+                'region': region['region'],
+                'live_objects': len(region['live']),
+                'garbage_objects': len(region['garbage']),
+                'live_bytes': region['live_bytes'],
+                'garbage_bytes': region['garbage_bytes'],
+                'remembered_set': len(region['remembered_set']),
+                'predicted_pause': round(region['predicted_pause'], 6)
+            }
+            for region in sorted(regions.values(), key=lambda region: region['region'])
+        ]
+    
+    def collect(self, pause_target: float = None) -> Dict:
+        """Run one garbage-first cycle"""
+        self.heap.finish_pending_sweep()
+        if pause_target is not None:
+            self.pause_target = pause_target
+        
+        mark_start = time.time()
+        original_count = len(self.heap.blocks)
+        live = self.mark()
+        regions = self.build_regions(live)
+        collection_set = self.select_regions(regions)
+        mark_time = (time.time() - mark_start) * 1000
+        
+        # Evacuation pause
+        start_time = time.time()
+        work: Dict[str, int] = {}
+        objects_freed = 0
+        bytes_reclaimed = 0
+        # Survivors are copied into regions outside the collection set so that every selected region empties
+        avoid = [
+            (region['region'] * self.region_size, (region['region'] + 1) * self.region_size)
+            for region in sorted(collection_set, key=lambda region: region['region'])
+        ]
+        for region in collection_set:
+            for category, amount in self.evacuate(region, avoid).items():
+                work[category] = work.get(category, 0) + amount
+            objects_freed += len(region['garbage'])
+            bytes_reclaimed += region['garbage_bytes']
+        end_time = time.time()
+        pause_duration = (end_time - start_time) * 1000
+        
+        predicted_pause = sum(region['predicted_pause'] for region in collection_set)
+        units = self.unit_costs.price(work)['virtual_work']
+        if self.heap.cost_model is None and units > 0:
+            # Decaying average of the measured cost per work unit
+            self.ms_per_unit = 0.7 * self.ms_per_unit + 0.3 * pause_duration / units
+        
+        metrics = {
+            'algorithm': self.name,
+            'objects_scanned': original_count,
+            'objects_freed': objects_freed,
+            'bytes_reclaimed': bytes_reclaimed,
+            'pause_duration': round(pause_duration, 3),
+            'mark_time': round(mark_time, 3),
+            'pause_target': self.pause_target,
+            'predicted_pause': round(predicted_pause, 6),
+            'regions_total': len(regions),
+            'regions_selected': [region['region'] for region in collection_set],
+            'regions_freed': len({region['region'] for region in collection_set} - self.occupied_regions()),
+            'garbage_left': sum(region['garbage_bytes'] for region in regions.values()) - bytes_reclaimed,
+            'timestamp': datetime.now(timezone.utc).isoformat(),
+            'compaction': True
+        }
+        if self.heap.cost_model is not None:
+            metrics.update(self.heap.cost_model.price(work))
+        return metrics
@@ -0,0 +1,120 @@
+from typing import Dict, Optional
+import logging
+import mmap
+import os
+import pickle
+import struct
+
+# flock is POSIX-only; the shared store is simply unavailable elsewhere
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class HeapStore:
+    """Simulation state shared between worker processes through a memory-mapped file.
+    
+    The file holds a small header (magic, generation, payload length) followed by
+    the pickled state. Readers take a shared ``flock`` and only unpickle when the
+    generation moved since they last loaded, so read-heavy traffic is served from
+    each worker's local copy; writers take an exclusive lock, store a new payload
+    and bump the generation. Put the file on tmpfs (e.g. ``/dev/shm``) to keep it
+    in shared memory.
+    """
+    
+    MAGIC = b'GCMAXY01'
+    HEADER = struct.Struct('<8sQQ')  # magic, generation, payload length
+    
+    def __init__(self, path: str, initial_size: int = 1 << 20):
+        if fcntl is None:
+            raise RuntimeError("HeapStore requires fcntl (POSIX)")
+        self.path = path
+        self.generation = 0  # Generation of the state this process last loaded or saved
+        self._fd = os.open(path, os.O_RDWR | os.O_CREAT, 0o600)
+        self._lock_fd = os.open(path + '.lock', os.O_RDWR | os.O_CREAT, 0o600)
+        if os.fstat(self._fd).st_size < initial_size:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+            try:
+                if os.fstat(self._fd).st_size < initial_size:
+                    os.ftruncate(self._fd, initial_size)
+            finally:
+                fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+        self._map: Optional[mmap.mmap] = None
+        self._remap()
+    
+    def _remap(self):
+        """Map the whole file, picking up growth done by another process"""
+        size = os.fstat(self._fd).st_size
+        if self._map is not None:
+            if len(self._map) == size:
+                return
+            self._map.close()
+        self._map = mmap.mmap(self._fd, size)
+    
+    def acquire(self, exclusive: bool):
+        """Take the cross-process lock (blocking)"""
+        fcntl.flock(self._lock_fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+    
+    def release(self):
+        """Release the cross-process lock"""
+        fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+    
+    def _read_header(self) -> tuple:
+        """Return (generation, payload length); generation 0 means nothing stored yet"""
+        self._remap()
+        magic, generation, length = self.HEADER.unpack_from(self._map, 0)
+        if magic != self.MAGIC:
+            return 0, 0
+        return generation, length
+    
+    def load_if_changed(self) -> Optional[Dict]:
+        """Return the stored state if another process saved a newer one; call with the lock held"""
+        generation, length = self._read_header()
+        if generation == 0 or generation == self.generation:
+            return None
+        
+        start = self.HEADER.size
+        try:
+            state = pickle.loads(self._map[start:start + length])
+        except Exception:
+            # Usually a payload written by an older version of the code
+            logger.warning("Discarding unreadable shared heap state in %s", self.path)
+            return None
+        self.generation = generation
+        return state
+    
+    def save(self, state: Dict):
+        """Store a new state; call with the exclusive lock held"""
+        payload = pickle.dumps(state, protocol=pickle.HIGHEST_PROTOCOL)
+        needed = self.HEADER.size + len(payload)
+        if len(self._map) < needed:
+            os.ftruncate(self._fd, max(needed, 2 * len(self._map)))
+            self._remap()
+        
+        generation, _ = self._read_header()
+        generation = max(generation, self.generation) + 1
+        self._map[self.HEADER.size:needed] = payload
+        self.HEADER.pack_into(self._map, 0, self.MAGIC, generation, len(payload))
+        self.generation = generation
+    
+    def get_stats(self) -> Dict:
+        """Get store location, size and current generation"""
+        generation, length = self._read_header()
+        return {
+            'path': self.path,
+            'pid': os.getpid(),
+            'generation': generation,
+            'loaded_generation': self.generation,
+            'payload_bytes': length,
+            'mapped_bytes': len(self._map)
+        }
+    
+    def close(self):
+        """Unmap and close the store files"""
+        if self._map is not None:
+            self._map.close()
+            self._map = None
+        os.close(self._fd)
+        os.close(self._lock_fd)
@@ -1,5 +1,5 @@
 import random
-from typing import List, Tuple
+from typing import Dict, List, Optional, Tuple
 from .memory import HeapSimulator
 
 class WorkloadGenerator:
@@ -8,13 +8,13 @@ class WorkloadGenerator:
     def __init__(self, heap: HeapSimulator):
         self.heap = heap
     
-    def random_allocation(self, count: int = 10, root_prob: float = 0.3) -> List[str]:
+    def random_allocation(self, count: int = 10, root_prob: float = 0.3, site: str = "random") -> List[str]:
         """Allocate random objects"""
         allocated = []
         for _ in range(count):
             size = random.randint(1, 3)
             is_root = random.random() < root_prob
-            block_id = self.heap.allocate(size=size, root=is_root)
+            block_id = self.heap.allocate(size=size, root=is_root, site=site)
             if block_id:
                 allocated.append(block_id)
         return allocated
@@ -26,11 +26,11 @@ class WorkloadGenerator:
                 if from_block != to_block and random.random() < ref_density:
                     self.heap.add_reference(from_block, to_block)
     
-    def create_circular_reference(self, size: int = 3) -> List[str]:
+    def create_circular_reference(self, size: int = 3, site: str = "circular") -> List[str]:
         """Create a circular reference chain"""
         blocks = []
         for _ in range(size):
-            block_id = self.heap.allocate(size=1, root=False)
+            block_id = self.heap.allocate(size=1, root=False, site=site)
             if block_id:
                 blocks.append(block_id)
         
@@ -41,28 +41,28 @@ class WorkloadGenerator:
         
         return blocks
     
-    def simulate_long_lived_objects(self, count: int = 5) -> List[str]:
+    def simulate_long_lived_objects(self, count: int = 5, site: str = "long-lived") -> List[str]:
         """Create long-lived root objects"""
         objects = []
         for _ in range(count):
-            obj_id = self.heap.allocate(size=random.randint(2, 5), root=True)
+            obj_id = self.heap.allocate(size=random.randint(2, 5), root=True, site=site)
             if obj_id:
                 objects.append(obj_id)
         return objects
     
-    def simulate_short_lived_objects(self, count: int = 10) -> List[str]:
+    def simulate_short_lived_objects(self, count: int = 10, site: str = "short-lived") -> List[str]:
         """Create short-lived non-root objects"""
         objects = []
         for _ in range(count):
-            obj_id = self.heap.allocate(size=1, root=False)
+            obj_id = self.heap.allocate(size=1, root=False, site=site)
             if obj_id:
                 objects.append(obj_id)
         return objects
     
-    def mixed_workload(self) -> Tuple[List[str], List[str]]:
+    def mixed_workload(self, site: str = "mixed") -> Tuple[List[str], List[str]]:
         """Generate a mixed workload"""
-        long_lived = self.simulate_long_lived_objects(count=3)
-        short_lived = self.simulate_short_lived_objects(count=7)
+        long_lived = self.simulate_long_lived_objects(count=3, site=f"{site}/long-lived")
+        short_lived = self.simulate_short_lived_objects(count=7, site=f"{site}/short-lived")
         
         # Create some references from long-lived to short-lived
         for ll in long_lived[:2]:
@@ -70,3 +70,41 @@ class WorkloadGenerator:
                 self.heap.add_reference(ll, sl)
         
         return long_lived, short_lived
+    
+    def run(self, workload_type: str, count: int = 10, root_prob: float = 0.3,
+            ref_density: float = 0.3, site: Optional[str] = None) -> Dict:
+        """Run a named workload pattern and describe what it allocated"""
+        site = site or workload_type  # Objects are tagged with the workload unless the caller labels them
+        # New objects are only linked once the pattern has allocated them all, so no GC may run in between
+        with self.heap.allocation_batch():
+            return self._run_pattern(workload_type, count, root_prob, ref_density, site)
+    
+    def _run_pattern(self, workload_type: str, count: int, root_prob: float,
+                     ref_density: float, site: str) -> Dict:
+        """Allocate and link one workload pattern"""
+        if workload_type == "random":
+            allocated = self.random_allocation(count=count, root_prob=root_prob, site=site)
+            self.create_references(allocated, ref_density=ref_density)
+            return {"allocated": allocated, "count": len(allocated)}
+        
+        if workload_type == "circular":
+            blocks = self.create_circular_reference(size=count, site=site)
+            return {"circular_chain": blocks, "count": len(blocks)}
+        
+        if workload_type == "long-lived":
+            objects = self.simulate_long_lived_objects(count=count, site=site)
+            return {"long_lived": objects, "count": len(objects)}
+        
+        if workload_type == "short-lived":
+            objects = self.simulate_short_lived_objects(count=count, site=site)
+            return {"short_lived": objects, "count": len(objects)}
+        
+        if workload_type == "mixed":
+            long_lived, short_lived = self.mixed_workload(site=site)
+            return {
+                "long_lived": long_lived,
+                "short_lived": short_lived,
+                "total": len(long_lived) + len(short_lived)
+            }
+        
+        raise ValueError(f"Unknown workload type: {workload_type}")
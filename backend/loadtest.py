@@ -0,0 +1,232 @@
+"""Load generator for the GC simulator API.
+
+Replays a weighted mix of allocate, reference, workload, collect and
+state-polling requests against the FastAPI app at one or more concurrency
+levels and reports throughput and latency percentiles per endpoint.
+
+By default the app is driven in-process through ASGI (no network, no
+uvicorn); pass --url to measure a running server instead:
+
+    python loadtest.py --concurrency 1,4,16 --duration 10
+    python loadtest.py --url http://localhost:8001 --mix allocate=60,state=40
+
+Requires httpx (pip install httpx).
+"""
+from typing import Dict, List, Optional
+import argparse
+import asyncio
+import json
+import logging
+import random
+import time
+
+from gc_engine.metrics import percentile
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+DEFAULT_MIX = {
+    'allocate': 40,
+    'reference': 25,
+    'state': 20,
+    'workload': 5,
+    'collect': 10
+}
+
+WORKLOAD_TYPES = ('random', 'short-lived', 'long-lived', 'mixed')
+ALGORITHMS = ('mark-sweep', 'generational', 'copying', 'reference-counting', 'region')
+
+def parse_mix(text: str) -> Dict[str, int]:
+    """Parse 'allocate=40,state=20' into operation weights"""
+    mix = {}
+    for item in text.split(','):
+        name, _, weight = item.partition('=')
+        name = name.strip()
+        if name not in DEFAULT_MIX:
+            raise ValueError(f"Unknown operation: {name}")
+        mix[name] = int(weight)
+    if not any(weight > 0 for weight in mix.values()):
+        raise ValueError("The mix needs at least one operation with a positive weight")
+    return mix
+
+class LoadTest:
+    """Closed-loop load run: each worker sends its next request as soon as the previous one answers"""
+    
+    def __init__(self, client, mix: Dict[str, int], algorithms=ALGORITHMS,
+                 workload_count: int = 20, seed: Optional[int] = None):
+        self.client = client
+        self.operations = [name for name, weight in mix.items() if weight > 0]
+        self.weights = [mix[name] for name in self.operations]
+        self.algorithms = list(algorithms)
+        self.workload_count = workload_count
+        self.random = random.Random(seed)
+        self.block_ids: List[str] = []  # Recently allocated ids used as reference endpoints
+        self.latencies: Dict[str, List[float]] = {}
+        self.errors: Dict[str, int] = {}
+    
+    def _remember(self, block_id: str):
+        """Keep a bounded pool of known block ids"""
+        self.block_ids.append(block_id)
+        if len(self.block_ids) > 1000:
+            del self.block_ids[:500]
+    
+    async def _send(self, label: str, method: str, path: str, **kwargs):
+        """Time one request and record it under an endpoint label"""
+        start = time.perf_counter()
+        response = await self.client.request(method, path, **kwargs)
+        elapsed = (time.perf_counter() - start) * 1000
+        self.latencies.setdefault(label, []).append(elapsed)
+        # 4xx from a full heap or a collected block is part of the workload, not a failure to serve
+        if response.status_code >= 500:
+            self.errors[label] = self.errors.get(label, 0) + 1
+        return response
+    
+    async def run_operation(self, operation: str):
+        """Issue one request of the given kind"""
+        rng = self.random
+        if operation == 'allocate':
+            response = await self._send('POST /api/heap/allocate', 'POST', '/api/heap/allocate', json={
+                'size': rng.randint(1, 4),
+                'root': rng.random() < 0.2
+            })
+            if response.status_code == 200:
+                self._remember(response.json()['block_id'])
+        
+        elif operation == 'reference':
+            if len(self.block_ids) < 2:
+                return await self.run_operation('allocate')
+            from_id, to_id = rng.sample(self.block_ids, 2)
+            await self._send('POST /api/heap/reference', 'POST', '/api/heap/reference', json={
+                'from_id': from_id,
+                'to_id': to_id
+            })
+        
+        elif operation == 'workload':
+            await self._send('POST /api/workload/generate', 'POST', '/api/workload/generate', json={
+                'type': rng.choice(WORKLOAD_TYPES),
+                'count': self.workload_count
+            })
+        
+        elif operation == 'collect':
+            await self._send('POST /api/gc/collect', 'POST', '/api/gc/collect', json={
+                'algorithm': rng.choice(self.algorithms)
+            })
+        
+        elif operation == 'state':
+            await self._send('GET /api/heap/state', 'GET', '/api/heap/state')
+    
+    async def worker(self, deadline: float, budget: List[int]):
+        """Send requests until the deadline passes or the shared request budget runs out"""
+        while time.perf_counter() < deadline and budget[0] != 0:
+            budget[0] -= 1
+            operation = self.random.choices(self.operations, self.weights)[0]
+            await self.run_operation(operation)
+    
+    async def run(self, concurrency: int, duration: float, max_requests: Optional[int] = None) -> Dict:
+        """Run the workers and summarise throughput and latency per endpoint"""
+        self.latencies = {}
+        self.errors = {}
+        budget = [max_requests if max_requests is not None else -1]
+        start = time.perf_counter()
+        deadline = start + duration
+        await asyncio.gather(*(self.worker(deadline, budget) for _ in range(concurrency)))
+        elapsed = time.perf_counter() - start
+        
+        endpoints = {}
+        all_latencies = []
+        for label, latencies in sorted(self.latencies.items()):
+            latencies.sort()
+            all_latencies.extend(latencies)
+            endpoints[label] = summarize(latencies, elapsed, self.errors.get(label, 0))
+        all_latencies.sort()
+        
+        return {
+            'concurrency': concurrency,
+            'duration': round(elapsed, 3),
+            'total': summarize(all_latencies, elapsed, sum(self.errors.values())),
+            'endpoints': endpoints
+        }
+
+def summarize(latencies: List[float], elapsed: float, errors: int) -> Dict:
+    """Throughput and latency percentiles (ms) of sorted latencies"""
+    return {
+        'requests': len(latencies),
+        'errors': errors,
+        'throughput': round(len(latencies) / elapsed, 1) if elapsed > 0 else 0.0,
+        'p50': round(percentile(latencies, 50), 3),
+        'p90': round(percentile(latencies, 90), 3),
+        'p99': round(percentile(latencies, 99), 3),
+        'max': round(latencies[-1], 3) if latencies else 0.0
+    }
+
+def format_report(result: Dict) -> str:
+    """Plain-text table for one concurrency level"""
+    lines = [
+        f"concurrency={result['concurrency']} duration={result['duration']}s",
+        f"{'endpoint':<30} {'reqs':>7} {'err':>5} {'req/s':>9} {'p50':>8} {'p90':>8} {'p99':>8} {'max':>8}"
+    ]
+    rows = list(result['endpoints'].items()) + [('total', result['total'])]
+    for label, row in rows:
+        lines.append(
+            f"{label:<30} {row['requests']:>7} {row['errors']:>5} {row['throughput']:>9} "
+            f"{row['p50']:>8} {row['p90']:>8} {row['p99']:>8} {row['max']:>8}"
+        )
+    return '\n'.join(lines)
+
+async def main(args) -> List[Dict]:
+    """Initialise the heap, then run every requested concurrency level against it"""
+    # httpx logs every request at INFO, which would swamp the report
+    logging.getLogger('httpx').setLevel(logging.WARNING)
+    if args.url:
+        client = httpx.AsyncClient(base_url=args.url, timeout=args.timeout)
+    else:
+        from server import app
+        # Turn unhandled app errors into 500 responses so they are counted, as they are against --url
+        transport = httpx.ASGITransport(app=app, raise_app_exceptions=False)
+        client = httpx.AsyncClient(transport=transport, base_url='http://loadtest', timeout=args.timeout)
+    
+    results = []
+    async with client:
+        for concurrency in args.concurrency:
+            if not args.no_init:
+                response = await client.post('/api/heap/init', json={
+                    'total_size': args.heap_size,
+                    'block_size': args.block_size
+                })
+                response.raise_for_status()
+            load = LoadTest(client, args.mix, args.algorithms, args.workload_count, args.seed)
+            result = await load.run(concurrency, args.duration, args.requests)
+            results.append(result)
+            if not args.json:
+                print(format_report(result) + '\n')
+    
+    if args.json:
+        print(json.dumps(results, indent=2))
+    return results
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(description="Load-test the GC simulator API")
+    parser.add_argument('--url', help="Base URL of a running server (default: drive the app in-process)")
+    parser.add_argument('--concurrency', type=lambda text: [int(n) for n in text.split(',')], default=[8],
+                        help="Concurrent clients, or a comma-separated list to find the latency knee")
+    parser.add_argument('--duration', type=float, default=10.0, help="Seconds per concurrency level")
+    parser.add_argument('--requests', type=int, help="Stop each level after this many requests")
+    parser.add_argument('--mix', type=parse_mix, default=DEFAULT_MIX,
+                        help="Operation weights, e.g. allocate=40,reference=25,state=20,workload=5,collect=10")
+    parser.add_argument('--algorithms', type=lambda text: text.split(','), default=list(ALGORITHMS),
+                        help="Collectors chosen at random for collect requests")
+    parser.add_argument('--workload-count', type=int, default=20, help="Objects per workload request")
+    parser.add_argument('--heap-size', type=int, default=65536, help="Heap size in bytes for /api/heap/init")
+    parser.add_argument('--block-size', type=int, default=16, help="Block size in bytes for /api/heap/init")
+    parser.add_argument('--no-init', action='store_true', help="Keep the server's current heap")
+    parser.add_argument('--seed', type=int, help="Seed for the request mix")
+    parser.add_argument('--timeout', type=float, default=30.0, help="Per-request timeout in seconds")
+    parser.add_argument('--json', action='store_true', help="Print results as JSON")
+    return parser
+
+if __name__ == '__main__':
+    if httpx is None:
+        raise SystemExit("loadtest.py requires httpx: pip install httpx")
+    asyncio.run(main(build_parser().parse_args()))
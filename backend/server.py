@@ -1,6 +1,9 @@
-from fastapi import FastAPI, APIRouter, HTTPException
+from fastapi import FastAPI, APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from dotenv import load_dotenv
+from starlette.concurrency import run_in_threadpool
 from starlette.middleware.cors import CORSMiddleware
+import asyncio
 import os
 import logging
 from pathlib import Path
@@ -9,13 +12,24 @@ from typing import List, Dict, Optional
 import uuid
 from datetime import datetime, timezone
 
-from gc_engine.memory import HeapSimulator
+from gc_engine.memory import HeapSimulator, BLOCK_FIELDS
 from gc_engine.mark_sweep import MarkSweepGC
 from gc_engine.reference_counting import ReferenceCountingGC
 from gc_engine.generational import GenerationalGC
 from gc_engine.copying import CopyingGC
+from gc_engine.region import RegionGC
 from gc_engine.metrics import MetricsTracker
 from gc_engine.workload import WorkloadGenerator
+from gc_engine.policy import GCPolicy
+from gc_engine.analytics import HeapAnalyzer
+from gc_engine.reachability import ReachabilityIndex
+from gc_engine.encoding import dumps_json, dumps_msgpack, msgpack_available, to_columnar
+from gc_engine.store import HeapStore
+from gc_engine.cost_model import CostModel
+from gc_engine.pretenuring import AllocationSiteTracker
+from gc_engine.history import HeapHistory
+from gc_engine.experiments import expand_grid, grid_size, run_sweep, COLLECTORS, WORKLOAD_TYPES
+from gc_engine.locality import analyze_locality, DEFAULT_HIERARCHY
 
 # Configure logging first
 logging.basicConfig(
@@ -49,16 +63,96 @@ mark_sweep_gc = MarkSweepGC(heap)
 ref_counting_gc = ReferenceCountingGC(heap)
 generational_gc = GenerationalGC(heap, promotion_age=2)
 copying_gc = CopyingGC(heap)
+region_gc = RegionGC(heap)
 metrics_tracker = MetricsTracker()
 workload_gen = WorkloadGenerator(heap)
+heap_analyzer = HeapAnalyzer(heap)
+
+# Heap checkpoints around recorded cycles, off until POST /api/history; kept across heap re-initialisation
+history_config: Optional[Dict] = None
+# Incremental reachability index settings, off until POST /api/heap/reachability; kept the same way
+reachability_config: Optional[Dict] = None
 
 gc_algorithms = {
     'mark-sweep': mark_sweep_gc,
     'reference-counting': ref_counting_gc,
     'generational': generational_gc,
-    'copying': copying_gc
+    'copying': copying_gc,
+    'region': region_gc
+}
+
+# Constructors for running collectors on scratch copies of the heap
+collector_factories = {
+    'mark-sweep': MarkSweepGC,
+    'reference-counting': ReferenceCountingGC,
+    'generational': GenerationalGC,
+    'copying': CopyingGC,
+    'copying-bfs': lambda h: CopyingGC(h, order='breadth-first'),
+    'region': RegionGC
 }
 
+# Optional allocation-triggered GC policy (disabled until configured)
+gc_policy: Optional[GCPolicy] = None
+
+# Optional deterministic cost model; kept across heap re-initialisation
+cost_model: Optional[CostModel] = None
+
+# Optional cross-process store so several uvicorn workers serve one simulation
+HEAP_STORE_PATH = os.getenv("HEAP_STORE_PATH")
+heap_store = HeapStore(HEAP_STORE_PATH) if HEAP_STORE_PATH else None
+state_lock = asyncio.Lock()  # Serializes requests within this worker
+SHARED_STATE = (
+    'heap', 'mark_sweep_gc', 'ref_counting_gc', 'generational_gc', 'copying_gc',
+    'region_gc', 'metrics_tracker', 'workload_gen', 'gc_algorithms', 'gc_policy', 'cost_model',
+    'history_config', 'reachability_config'
+)
+# POST endpoints that only read the simulation (they work on clones); they never republish the state
+READ_ONLY_ROUTES = frozenset({'/api/analytics/locality'})
+
+if heap_store is None and int(os.getenv("WEB_CONCURRENCY", "1")) > 1:
+    logger.warning("WEB_CONCURRENCY > 1 without HEAP_STORE_PATH: each worker will simulate its own heap")
+
+
+def export_state() -> Dict:
+    """Collect the module-level simulation objects for the shared store"""
+    return {name: globals()[name] for name in SHARED_STATE}
+
+def import_state(state: Dict):
+    """Replace the module-level simulation objects with ones loaded from the store"""
+    global heap_analyzer
+    globals().update(state)
+    heap_analyzer = HeapAnalyzer(heap)
+
+@app.middleware("http")
+async def sync_shared_state(request: Request, call_next):
+    """Load newer shared state before an API request and publish it after a write"""
+    # Parameter sweeps run on their own heaps and never touch the shared simulation
+    if heap_store is None or not request.url.path.startswith("/api") or request.url.path.startswith("/api/experiments"):
+        return await call_next(request)
+    
+    write = request.method not in ("GET", "HEAD", "OPTIONS") and request.url.path not in READ_ONLY_ROUTES
+    async with state_lock:
+        await run_in_threadpool(heap_store.acquire, write)
+        try:
+            state = heap_store.load_if_changed()
+            if state is not None:
+                import_state(state)
+            try:
+                response = await call_next(request)
+            except Exception:
+                # The request may have left globals half-updated without publishing them: reload on the next request
+                heap_store.generation = 0
+                raise
+            if write:
+                heap_store.save(export_state())
+        finally:
+            heap_store.release()
+    return response
+
+def fast_json(payload: Dict) -> Response:
+    """Serialize a block-heavy payload directly, bypassing FastAPI's generic encoder"""
+    return Response(content=dumps_json(payload), media_type="application/json")
+
 
 # Define Models
 class HeapConfig(BaseModel):
@@ -68,6 +162,7 @@ class HeapConfig(BaseModel):
 class AllocationRequest(BaseModel):
     size: int = 1
     root: bool = False
+    site: Optional[str] = None
 
 class ReferenceRequest(BaseModel):
     from_id: str
@@ -76,12 +171,89 @@ class ReferenceRequest(BaseModel):
 class GCRequest(BaseModel):
     algorithm: str
     minor_only: Optional[bool] = True
+    lazy_sweep: Optional[bool] = False
+    copy_order: Optional[str] = None
+    pause_target: Optional[float] = None
+
+class SweepRequest(BaseModel):
+    regions: Optional[int] = None
 
 class WorkloadRequest(BaseModel):
     type: str
     count: Optional[int] = 10
     root_prob: Optional[float] = 0.3
     ref_density: Optional[float] = 0.3
+    site: Optional[str] = None
+
+class ReachabilityConfig(BaseModel):
+    enabled: bool = True
+    max_recheck: int = Field(default=1000, ge=1)
+
+class CostModelConfig(BaseModel):
+    enabled: bool = True
+    root_scan: float = Field(default=5.0, ge=0)
+    mark_object: float = Field(default=10.0, ge=0)
+    trace_edge: float = Field(default=2.0, ge=0)
+    copy_word: float = Field(default=1.0, ge=0)
+    sweep_object: float = Field(default=3.0, ge=0)
+    refcount_update: float = Field(default=1.0, ge=0)
+    ms_per_unit: float = Field(default=0.0001, gt=0)
+
+class PretenuringConfig(BaseModel):
+    enabled: bool = True
+    survival_threshold: float = Field(default=0.8, gt=0, le=1)
+    min_samples: int = Field(default=20, ge=1)
+
+class HistoryConfig(BaseModel):
+    enabled: bool = True
+    keyframe_interval: int = Field(default=16, ge=1)
+    memory_budget_mb: float = Field(default=16, gt=0)
+
+MAX_SWEEP_CONFIGURATIONS = 512
+MAX_SWEEP_VALUES = 64  # Values per swept parameter
+
+class ParameterSweepRequest(BaseModel):
+    total_sizes: List[int] = Field(default=[1024], min_length=1, max_length=MAX_SWEEP_VALUES)
+    block_sizes: List[int] = Field(default=[16], min_length=1, max_length=MAX_SWEEP_VALUES)
+    algorithms: List[str] = Field(default=['mark-sweep'], min_length=1, max_length=MAX_SWEEP_VALUES)
+    promotion_ages: List[int] = Field(default=[2], min_length=1, max_length=MAX_SWEEP_VALUES)
+    workloads: List[str] = Field(default=['random'], min_length=1, max_length=MAX_SWEEP_VALUES)
+    counts: List[int] = Field(default=[10], min_length=1, max_length=MAX_SWEEP_VALUES)
+    root_probs: List[float] = Field(default=[0.3], min_length=1, max_length=MAX_SWEEP_VALUES)
+    ref_densities: List[float] = Field(default=[0.3], min_length=1, max_length=MAX_SWEEP_VALUES)
+    rounds: int = Field(default=20, ge=1, le=10000)
+    seed: int = 0
+    cost_model: bool = False
+    max_workers: Optional[int] = Field(default=None, ge=1, le=64)
+    stream: bool = False
+
+MAX_CACHE_SETS = 1 << 16  # Each simulated set is its own LRU dict
+
+class CacheGeometry(BaseModel):
+    size: int = Field(gt=0, le=1 << 30)
+    line_size: int = Field(gt=0, le=1 << 16)
+    associativity: int = Field(gt=0, le=1024)
+
+class TLBGeometry(BaseModel):
+    entries: int = Field(gt=0, le=MAX_CACHE_SETS)
+    page_size: int = Field(gt=0, le=1 << 30)
+    associativity: int = Field(gt=0, le=1024)
+
+class LocalityRequest(BaseModel):
+    algorithms: Optional[List[str]] = None
+    workloads: Optional[List[str]] = Field(default=None, max_length=16)
+    workload_count: int = Field(default=50, ge=1, le=10000)
+    traversal: str = 'depth-first'
+    l1: CacheGeometry = CacheGeometry(**DEFAULT_HIERARCHY['l1'])
+    l2: Optional[CacheGeometry] = CacheGeometry(**DEFAULT_HIERARCHY['l2'])
+    tlb: TLBGeometry = TLBGeometry(**DEFAULT_HIERARCHY['tlb'])
+
+class PolicyConfig(BaseModel):
+    algorithm: str = 'generational'
+    occupancy_threshold: float = Field(default=0.8, gt=0, le=1)
+    adaptive: bool = True
+    growth_factor: float = Field(default=1.5, ge=1)
+    max_total_size: Optional[int] = None
 
 
 # GC Simulation Routes
@@ -89,17 +261,41 @@ class WorkloadRequest(BaseModel):
 async def root():
     return {"message": "GCmaxy API", "version": "1.0.0", "app": "GCmaxy - Garbage Collection Simulator"}
 
+@api_router.get("/store")
+async def get_store_status():
+    """Report whether simulation state is shared between workers"""
+    return {"shared": heap_store is not None, "store": heap_store.get_stats() if heap_store else None}
+
 @api_router.post("/heap/init")
 async def init_heap(config: HeapConfig):
     """Initialize or reset heap with new configuration"""
-    global heap, mark_sweep_gc, ref_counting_gc, generational_gc, copying_gc, workload_gen
+    global heap, mark_sweep_gc, ref_counting_gc, generational_gc, copying_gc, region_gc, workload_gen, gc_policy, heap_analyzer
     
+    # Site statistics describe the workload, not the heap, so pretenuring decisions survive re-initialisation
+    sites = heap.sites
+    if sites is not None:
+        sites.forget_objects()
     heap = HeapSimulator(total_size=config.total_size, block_size=config.block_size)
+    heap.cost_model = cost_model
+    heap.sites = sites
+    heap.history = HeapHistory(heap, **history_config) if history_config else None
+    if reachability_config:
+        ReachabilityIndex(heap, **reachability_config).attach()
     mark_sweep_gc = MarkSweepGC(heap)
     ref_counting_gc = ReferenceCountingGC(heap)
     generational_gc = GenerationalGC(heap)
     copying_gc = CopyingGC(heap)
+    region_gc = RegionGC(heap)
     workload_gen = WorkloadGenerator(heap)
+    heap_analyzer = HeapAnalyzer(heap)
+    gc_algorithms.update({
+        'mark-sweep': mark_sweep_gc,
+        'reference-counting': ref_counting_gc,
+        'generational': generational_gc,
+        'copying': copying_gc,
+        'region': region_gc
+    })
+    gc_policy = None
     metrics_tracker.reset()
     
     return {"status": "success", "heap": heap.get_stats()}
@@ -107,16 +303,61 @@ async def init_heap(config: HeapConfig):
 @api_router.get("/heap/state")
 async def get_heap_state():
     """Get current heap state"""
-    return {
+    return fast_json({
         "stats": heap.get_stats(),
         "blocks": heap.get_all_blocks(),
         "roots": list(heap.roots)
+    })
+
+@api_router.get("/heap/blocks")
+async def query_blocks(
+    offset: int = Query(0, ge=0),
+    limit: int = Query(500, ge=1, le=10000),
+    generation: Optional[int] = None,
+    root: Optional[bool] = None,
+    min_age: Optional[int] = None,
+    max_age: Optional[int] = None,
+    min_size: Optional[int] = None,
+    max_size: Optional[int] = None,
+    fields: Optional[str] = None,
+    format: str = "json"
+):
+    """Query a filtered, paginated page of blocks with optional field projection"""
+    if format not in ("json", "columnar", "msgpack"):
+        raise HTTPException(status_code=400, detail=f"Unknown format: {format}")
+    if format == "msgpack" and not msgpack_available():
+        raise HTTPException(status_code=400, detail="msgpack encoding is not available on this server")
+    
+    selected = tuple(f.strip() for f in fields.split(",") if f.strip()) if fields else BLOCK_FIELDS
+    try:
+        total, page = heap.query_blocks(
+            offset=offset, limit=limit, generation=generation, root=root,
+            min_age=min_age, max_age=max_age, min_size=min_size, max_size=max_size,
+            fields=selected
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    payload = {
+        "total": total,
+        "offset": offset,
+        "limit": limit,
+        "count": len(page),
+        "fields": list(selected)
     }
+    if format == "json":
+        payload["blocks"] = page
+        return fast_json(payload)
+    
+    payload["columns"] = to_columnar(page, selected)
+    if format == "msgpack":
+        return Response(content=dumps_msgpack(payload), media_type="application/x-msgpack")
+    return fast_json(payload)
 
 @api_router.post("/heap/allocate")
 async def allocate_memory(request: AllocationRequest):
     """Allocate a memory block"""
-    block_id = heap.allocate(size=request.size, root=request.root)
+    block_id = heap.allocate(size=request.size, root=request.root, site=request.site)
     if not block_id:
         raise HTTPException(status_code=400, detail="Allocation failed: Out of memory")
     
@@ -163,23 +404,136 @@ async def run_gc(request: GCRequest):
         raise HTTPException(status_code=400, detail=f"Unknown algorithm: {request.algorithm}")
     
     gc = gc_algorithms[request.algorithm]
+    if request.algorithm == 'copying' and request.copy_order and request.copy_order not in CopyingGC.ORDERS:
+        raise HTTPException(status_code=400, detail=f"Unknown copying order: {request.copy_order}")
+    if request.algorithm == 'region' and request.pause_target is not None and request.pause_target <= 0:
+        raise HTTPException(status_code=400, detail="Pause target must be positive")
+    if heap.history is not None:
+        heap.history.capture_before()
     
     # Run collection
     if request.algorithm == 'generational':
         metrics = gc.collect(minor_only=request.minor_only)
+    elif request.algorithm == 'mark-sweep':
+        metrics = gc.collect(lazy=request.lazy_sweep)
+    elif request.algorithm == 'copying' and request.copy_order:
+        gc.order = request.copy_order
+        metrics = gc.collect()
+    elif request.algorithm == 'region':
+        metrics = gc.collect(pause_target=request.pause_target)
     else:
         metrics = gc.collect()
+    metrics['trigger'] = 'manual'
     
     # Record metrics
     metrics_tracker.record_cycle(metrics)
+    if heap.history is not None:
+        heap.history.capture_after(metrics['cycle_id'])
     
-    return {
+    return fast_json({
         "status": "success",
         "metrics": metrics,
         "heap": heap.get_stats(),
         "blocks": heap.get_all_blocks()
+    })
+
+@api_router.get("/gc/regions")
+async def get_regions():
+    """Per-region liveness and remembered-set sizes for the region-based collector"""
+    return {
+        "region_size": region_gc.region_size,
+        "pause_target": region_gc.pause_target,
+        "regions": region_gc.region_stats()
+    }
+
+@api_router.post("/gc/sweep")
+async def run_lazy_sweep(request: SweepRequest):
+    """Background sweep step: reclaim regions left unswept by a lazy mark-sweep cycle"""
+    if heap.sweeper is None:
+        return {"status": "success", "regions_swept": 0, "regions_pending": 0, "heap": heap.get_stats()}
+    
+    sweeper = heap.sweeper
+    if request.regions is None:
+        swept = sweeper.finish_sweep()
+    else:
+        swept = sweeper.sweep(max_regions=request.regions)
+    
+    return {
+        "status": "success",
+        "regions_swept": swept,
+        "regions_pending": len(sweeper.pending_regions),
+        "heap": heap.get_stats()
     }
 
+@api_router.get("/gc/cost-model")
+async def get_cost_model():
+    """Get the virtual-time cost model, if enabled"""
+    return {"enabled": cost_model is not None, "costs": cost_model.to_dict() if cost_model else None}
+
+@api_router.post("/gc/cost-model")
+async def set_cost_model(config: CostModelConfig):
+    """Enable (with the given unit costs) or disable deterministic virtual pauses"""
+    global cost_model
+    if config.enabled:
+        cost_model = CostModel(**config.model_dump(exclude={'enabled'}))
+    else:
+        cost_model = None
+    heap.cost_model = cost_model
+    return {"status": "success", "enabled": cost_model is not None, "costs": cost_model.to_dict() if cost_model else None}
+
+@api_router.get("/gc/pretenuring")
+async def get_pretenuring():
+    """Per-allocation-site survival statistics and pretenuring decisions"""
+    return {"enabled": heap.sites is not None, "stats": heap.sites.get_stats() if heap.sites else None}
+
+@api_router.post("/gc/pretenuring")
+async def set_pretenuring(config: PretenuringConfig):
+    """Enable or disable pretenuring of high-survival allocation sites into the old generation"""
+    if config.enabled:
+        heap.sites = AllocationSiteTracker(
+            survival_threshold=config.survival_threshold,
+            min_samples=config.min_samples
+        )
+    else:
+        heap.sites = None
+    return {"status": "success", "enabled": heap.sites is not None, "stats": heap.sites.get_stats() if heap.sites else None}
+
+@api_router.get("/gc/policy")
+async def get_gc_policy():
+    """Get the active GC policy, if any"""
+    return {"enabled": gc_policy is not None, "policy": gc_policy.get_state() if gc_policy else None}
+
+@api_router.post("/gc/policy")
+async def set_gc_policy(config: PolicyConfig):
+    """Enable allocation-triggered collection with the given policy settings"""
+    global gc_policy
+    if config.algorithm not in gc_algorithms:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {config.algorithm}")
+    
+    if gc_policy is not None:
+        gc_policy.detach()
+    gc_policy = GCPolicy(
+        heap,
+        gc_algorithms[config.algorithm],
+        metrics_tracker,
+        occupancy_threshold=config.occupancy_threshold,
+        adaptive=config.adaptive,
+        growth_factor=config.growth_factor,
+        max_total_size=config.max_total_size
+    )
+    gc_policy.attach()
+    
+    return {"status": "success", "policy": gc_policy.get_state()}
+
+@api_router.delete("/gc/policy")
+async def disable_gc_policy():
+    """Disable the GC policy; collections happen only on explicit requests again"""
+    global gc_policy
+    if gc_policy is not None:
+        gc_policy.detach()
+        gc_policy = None
+    return {"status": "success"}
+
 @api_router.get("/metrics/cycles")
 async def get_all_cycles():
     """Get all GC cycles"""
@@ -198,44 +552,128 @@ async def get_algorithm_comparison():
     """Get algorithm comparison"""
     return metrics_tracker.get_algorithm_comparison()
 
+@api_router.get("/metrics/policy")
+async def get_policy_decisions():
+    """Get decisions taken by the GC policy"""
+    return {"decisions": metrics_tracker.get_policy_decisions()}
+
 @api_router.get("/metrics/export/csv")
 async def export_metrics_csv():
     """Export metrics as CSV"""
     csv_data = metrics_tracker.export_csv()
     return {"csv": csv_data}
 
-@api_router.post("/workload/generate")
-async def generate_workload(request: WorkloadRequest):
-    """Generate test workload"""
-    result = {}
+@api_router.get("/analytics/scc")
+async def get_condensed_graph(limit: int = Query(100, ge=1, le=10000)):
+    """Strongly connected components collapsed into a summary graph"""
+    return fast_json(heap_analyzer.condensed_graph(limit=limit))
+
+@api_router.get("/analytics/retainers")
+async def get_top_retainers(top: int = Query(10, ge=1, le=1000)):
+    """Objects retaining the most memory according to the dominator tree"""
+    return fast_json(heap_analyzer.top_retainers(limit=top))
+
+@api_router.get("/analytics/dominators/{block_id}")
+async def get_dominator_path(block_id: str):
+    """Dominator chain explaining what keeps a block alive"""
+    if block_id not in heap.blocks:
+        raise HTTPException(status_code=404, detail="Block not found")
+    path = heap_analyzer.dominator_path(block_id)
+    return {"block_id": block_id, "reachable": path is not None, "dominators": path or []}
+
+@api_router.post("/analytics/locality")
+async def analyze_heap_locality(request: LocalityRequest):
+    """Cache/TLB miss rates of each collector and of the mutator over the layout it leaves"""
+    algorithms = request.algorithms or list(collector_factories)
+    unknown = [name for name in algorithms if name not in collector_factories]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm: {', '.join(unknown)}")
+    if request.traversal not in CopyingGC.ORDERS:
+        raise HTTPException(status_code=400, detail=f"Unknown traversal: {request.traversal}")
+    workloads = request.workloads or ['current']
+    unknown = [name for name in workloads if name != 'current' and name not in WORKLOAD_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown workload: {', '.join(unknown)}")
+    caches = [('l1', request.l1), ('l2', request.l2)]
+    for name, geometry in caches:
+        if geometry is not None and geometry.size // (geometry.line_size * geometry.associativity) > MAX_CACHE_SETS:
+            raise HTTPException(status_code=400, detail=f"{name}: more than {MAX_CACHE_SETS} sets")
     
-    if request.type == "random":
-        allocated = workload_gen.random_allocation(count=request.count, root_prob=request.root_prob)
-        workload_gen.create_references(allocated, ref_density=request.ref_density)
-        result = {"allocated": allocated, "count": len(allocated)}
+    hierarchy = {
+        'l1': request.l1.model_dump(),
+        'l2': request.l2.model_dump() if request.l2 is not None else None,
+        'tlb': request.tlb.model_dump()
+    }
+    factories = {name: collector_factories[name] for name in algorithms}
     
-    elif request.type == "circular":
-        blocks = workload_gen.create_circular_reference(size=request.count)
-        result = {"circular_chain": blocks, "count": len(blocks)}
+    # Each workload runs on its own copy of the current heap, so the live heap is untouched
+    results = {}
+    for workload in workloads:
+        base = heap.clone()
+        if workload != 'current':
+            WorkloadGenerator(base).run(workload, count=request.workload_count)
+        results[workload] = analyze_locality(base, factories, hierarchy, request.traversal)
     
-    elif request.type == "long-lived":
-        objects = workload_gen.simulate_long_lived_objects(count=request.count)
-        result = {"long_lived": objects, "count": len(objects)}
+    return {"hierarchy": hierarchy, "workloads": results}
+
+@api_router.post("/experiments/sweep")
+async def run_parameter_sweep(request: ParameterSweepRequest):
+    """Run every combination of heap, collector and workload settings in a process pool"""
+    unknown = [name for name in request.algorithms if name not in COLLECTORS]
+    unknown += [name for name in request.workloads if name not in WORKLOAD_TYPES]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown algorithm or workload: {', '.join(unknown)}")
+    if min(request.total_sizes + request.block_sizes + request.counts) <= 0 or min(request.promotion_ages) < 1:
+        raise HTTPException(status_code=400, detail="Sizes and counts must be positive and promotion ages at least 1")
+    if min(request.total_sizes) < max(request.block_sizes):
+        # Every heap size is combined with every block size, and a heap needs room for at least one block
+        raise HTTPException(status_code=400, detail="Every total size must be at least the largest block size")
     
-    elif request.type == "short-lived":
-        objects = workload_gen.simulate_short_lived_objects(count=request.count)
-        result = {"short_lived": objects, "count": len(objects)}
+    grid = {
+        'total_size': request.total_sizes,
+        'block_size': request.block_sizes,
+        'algorithm': request.algorithms,
+        'promotion_age': request.promotion_ages,
+        'workload': request.workloads,
+        'count': request.counts,
+        'root_prob': request.root_probs,
+        'ref_density': request.ref_densities
+    }
+    # Count before expanding: the grid grows multiplicatively with every list
+    size = grid_size(grid)
+    if size > MAX_SWEEP_CONFIGURATIONS:
+        raise HTTPException(status_code=400, detail=f"{size} configurations exceed the limit of {MAX_SWEEP_CONFIGURATIONS}")
+    configs = expand_grid(grid)
     
-    elif request.type == "mixed":
-        long_lived, short_lived = workload_gen.mixed_workload()
-        result = {
-            "long_lived": long_lived,
-            "short_lived": short_lived,
-            "total": len(long_lived) + len(short_lived)
-        }
+    rows = run_sweep(configs, request.rounds, request.seed, request.cost_model, request.max_workers)
+    if request.stream:
+        async def ndjson():
+            # One line per configuration as it completes, then the full table in grid order
+            table = []
+            async for row in rows:
+                table.append(row)
+                yield dumps_json({"type": "result", "row": row}) + b"\n"
+            table.sort(key=lambda row: row['index'])
+            yield dumps_json({"type": "table", "configurations": len(configs), "table": table}) + b"\n"
+        return StreamingResponse(ndjson(), media_type="application/x-ndjson")
     
-    else:
-        raise HTTPException(status_code=400, detail=f"Unknown workload type: {request.type}")
+    table = [row async for row in rows]
+    table.sort(key=lambda row: row['index'])
+    return fast_json({"configurations": len(configs), "table": table})
+
+@api_router.post("/workload/generate")
+async def generate_workload(request: WorkloadRequest):
+    """Generate test workload"""
+    try:
+        result = workload_gen.run(
+            request.type,
+            count=request.count,
+            root_prob=request.root_prob,
+            ref_density=request.ref_density,
+            site=request.site
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
     return {
         "status": "success",
@@ -243,6 +681,74 @@ async def generate_workload(request: WorkloadRequest):
         "heap": heap.get_stats()
     }
 
+@api_router.post("/heap/reachability")
+async def configure_reachability(config: ReachabilityConfig):
+    """Enable or disable the incrementally maintained reachability index"""
+    global reachability_config
+    if heap.reachability is not None:
+        heap.reachability.detach()
+    if config.enabled:
+        reachability_config = {'max_recheck': config.max_recheck}
+        ReachabilityIndex(heap, **reachability_config).attach()
+    else:
+        reachability_config = None
+    
+    return {
+        "status": "success",
+        "enabled": heap.reachability is not None,
+        "index": heap.reachability.get_stats() if heap.reachability else None
+    }
+
+@api_router.get("/heap/garbage")
+async def get_garbage():
+    """Blocks a full collection would free right now"""
+    if heap.reachability is not None:
+        garbage = heap.reachability.garbage_set()
+        index_stats = heap.reachability.get_stats()
+    else:
+        # No index attached: a one-off (unattached) index is a full trace
+        garbage = ReachabilityIndex(heap).garbage_set()
+        index_stats = None
+    
+    return fast_json({
+        "count": len(garbage),
+        "bytes": sum(heap.blocks[block_id].size for block_id in garbage) * heap.block_size,
+        "block_ids": list(garbage),
+        "index": index_stats
+    })
+
+@api_router.get("/history")
+async def get_history():
+    """Recorded heap checkpoints and their estimated memory use"""
+    return {"enabled": heap.history is not None, "history": heap.history.get_stats() if heap.history else None}
+
+@api_router.post("/history")
+async def configure_history(config: HistoryConfig):
+    """Enable (discarding recorded checkpoints) or disable heap history"""
+    global history_config
+    if config.enabled:
+        history_config = {
+            'keyframe_interval': config.keyframe_interval,
+            'memory_budget': int(config.memory_budget_mb * (1 << 20))
+        }
+        heap.history = HeapHistory(heap, **history_config)
+    else:
+        history_config = None
+        heap.history = None
+    return {"status": "success", "enabled": heap.history is not None, "history": heap.history.get_stats() if heap.history else None}
+
+@api_router.get("/history/{cycle_id}")
+async def get_heap_at_cycle(cycle_id: int, phase: str = 'after'):
+    """The heap as it was before or after a recorded GC cycle"""
+    if phase not in ('before', 'after'):
+        raise HTTPException(status_code=400, detail="Phase must be 'before' or 'after'")
+    if heap.history is None:
+        raise HTTPException(status_code=404, detail="Heap history is disabled")
+    snapshot = heap.history.get_heap(cycle_id, phase)
+    if snapshot is None:
+        raise HTTPException(status_code=404, detail=f"No checkpoint for cycle {cycle_id} (never recorded or evicted)")
+    return fast_json(snapshot)
+
 @api_router.post("/heap/reset")
 async def reset_heap():
     """Reset heap and metrics"""
@@ -0,0 +1,74 @@
+import random
+
+import pytest
+
+from gc_engine.memory import HeapSimulator
+from gc_engine.analytics import HeapAnalyzer
+
+def random_heap(rng: random.Random, objects: int, edges: int) -> HeapSimulator:
+    """Heap with random sizes, roots and references, including cycles and self-references"""
+    heap = HeapSimulator(total_size=objects * 4 * 16, block_size=16)
+    ids = [heap.allocate(rng.randint(1, 4), root=rng.random() < 0.15) for _ in range(objects)]
+    for _ in range(edges):
+        heap.add_reference(rng.choice(ids), rng.choice(ids))
+    return heap
+
+def reachable(heap: HeapSimulator, starts, removed=None):
+    """Brute-force reachability, optionally with one object taken out of the graph"""
+    seen = set()
+    stack = [block_id for block_id in starts if block_id != removed]
+    while stack:
+        block_id = stack.pop()
+        if block_id in seen:
+            continue
+        seen.add(block_id)
+        stack.extend(ref for ref in heap.blocks[block_id].references if ref != removed and ref not in seen)
+    return seen
+
+SEEDS = range(25)
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_components_match_mutual_reachability(seed):
+    rng = random.Random(seed)
+    heap = random_heap(rng, rng.randint(1, 40), rng.randint(0, 80))
+    analyzer = HeapAnalyzer(heap)
+    graph = analyzer._graph()
+    component_of = analyzer.strongly_connected_components()['component_of']
+    reach = {block_id: reachable(heap, [block_id]) for block_id in heap.blocks}
+    for a in heap.blocks:
+        for b in heap.blocks:
+            same = component_of[graph['index'][a]] == component_of[graph['index'][b]]
+            assert same == (b in reach[a] and a in reach[b])
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_dominators_match_removal(seed):
+    rng = random.Random(seed)
+    heap = random_heap(rng, rng.randint(1, 40), rng.randint(0, 80))
+    analyzer = HeapAnalyzer(heap)
+    live = reachable(heap, heap.roots)
+    without = {block_id: reachable(heap, heap.roots, removed=block_id) for block_id in heap.blocks}
+    for block_id in heap.blocks:
+        path = analyzer.dominator_path(block_id)
+        if block_id not in live:
+            assert path is None
+            continue
+        # d strictly dominates v when every path from the roots to v passes through d
+        dominators = {d for d in heap.blocks if d != block_id and block_id not in without[d]}
+        assert path[-1] == block_id
+        assert set(path[:-1]) == dominators
+        assert len(path) == len(dominators) + 1
+
+@pytest.mark.parametrize('seed', SEEDS)
+def test_retained_sizes_match_removal(seed):
+    rng = random.Random(seed)
+    heap = random_heap(rng, rng.randint(1, 40), rng.randint(0, 80))
+    analyzer = HeapAnalyzer(heap)
+    graph = analyzer._graph()
+    retained = analyzer.retained_sizes()
+    live = reachable(heap, heap.roots)
+    for block_id in live:
+        freed = live - reachable(heap, heap.roots, removed=block_id)
+        node = graph['index'][block_id]
+        assert retained['objects'][node] == len(freed)
+        assert retained['bytes'][node] == sum(heap.blocks[b].size * heap.block_size for b in freed)
+    assert analyzer.top_retainers()['reachable_objects'] == len(live)
@@ -0,0 +1,54 @@
+import random
+
+import pytest
+
+from gc_engine.memory import HeapSimulator
+from gc_engine.cost_model import CostModel
+from gc_engine.mark_sweep import MarkSweepGC
+from gc_engine.reference_counting import ReferenceCountingGC
+from gc_engine.generational import GenerationalGC
+from gc_engine.copying import CopyingGC
+from gc_engine.region import RegionGC
+from gc_engine.workload import WorkloadGenerator
+
+COLLECTORS = {
+    'mark-sweep': lambda heap: MarkSweepGC(heap),
+    'mark-sweep-lazy': lambda heap: MarkSweepGC(heap, lazy=True),
+    'reference-counting': ReferenceCountingGC,
+    'generational': GenerationalGC,
+    'copying-depth-first': lambda heap: CopyingGC(heap, order='depth-first'),
+    'copying-breadth-first': lambda heap: CopyingGC(heap, order='breadth-first'),
+    'region': RegionGC
+}
+
+def virtual_pauses(make_gc, seed: int, cycles: int = 12):
+    """Virtual pause of every cycle of a seeded mixed workload"""
+    random.seed(seed)
+    heap = HeapSimulator(total_size=16384, block_size=16)
+    heap.cost_model = CostModel()
+    gc = make_gc(heap)
+    workload = WorkloadGenerator(heap)
+    pauses = []
+    for cycle in range(cycles):
+        workload.run(random.choice(['random', 'circular', 'long-lived', 'short-lived', 'mixed']), count=25)
+        if isinstance(gc, GenerationalGC):
+            metrics = gc.collect(minor_only=cycle % 4 != 3)
+        else:
+            metrics = gc.collect()
+        heap.finish_pending_sweep()
+        pauses.append(metrics['virtual_pause'])
+    return pauses
+
+@pytest.mark.parametrize('algorithm', sorted(COLLECTORS))
+def test_virtual_pause_is_deterministic(algorithm):
+    for seed in range(3):
+        first = virtual_pauses(COLLECTORS[algorithm], seed)
+        assert any(pause > 0 for pause in first)
+        assert virtual_pauses(COLLECTORS[algorithm], seed) == first
+
+def test_price_is_linear_in_work():
+    model = CostModel()
+    work = {'roots_scanned': 3, 'objects_marked': 10, 'edges_traced': 7, 'words_copied': 40}
+    doubled = {category: 2 * count for category, count in work.items()}
+    assert model.price(doubled)['virtual_work'] == 2 * model.price(work)['virtual_work']
+    assert model.price({})['virtual_pause'] == 0
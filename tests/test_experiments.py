@@ -0,0 +1,34 @@
+import time
+
+from fastapi.testclient import TestClient
+
+import server
+from gc_engine.experiments import expand_grid, grid_size
+
+def test_grid_size_matches_expansion():
+    grid = {
+        'total_size': [1024, 2048],
+        'block_size': [16],
+        'algorithm': ['mark-sweep', 'generational', 'region', 'generational'],
+        'promotion_age': [1, 2, 3],
+        'workload': ['random', 'mixed']
+    }
+    assert grid_size(grid) == len(expand_grid(grid)) == 2 * 2 * (2 + 2 * 3)
+
+def test_oversized_sweep_is_rejected_before_expansion():
+    client = TestClient(server.app)
+    values = list(range(1, 13))
+    start = time.perf_counter()
+    response = client.post('/api/experiments/sweep', json={
+        'total_sizes': [4096 + n for n in values],
+        'block_sizes': values,
+        'counts': values,
+        'root_probs': [n / 100 for n in values],
+        'ref_densities': [n / 100 for n in values],
+        'workloads': ['random', 'mixed', 'circular', 'long-lived', 'short-lived']
+    })
+    assert response.status_code == 400
+    assert time.perf_counter() - start < 1
+    
+    response = client.post('/api/experiments/sweep', json={'counts': list(range(1, 100))})
+    assert response.status_code == 422
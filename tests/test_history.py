@@ -0,0 +1,77 @@
+import random
+
+import pytest
+
+from gc_engine.memory import HeapSimulator, BLOCK_FIELDS
+from gc_engine.history import HeapHistory
+from gc_engine.generational import GenerationalGC
+from gc_engine.workload import WorkloadGenerator
+
+def snapshot(heap: HeapSimulator):
+    """Every block's fields, keyed by id, in the form get_heap returns them"""
+    blocks = {}
+    for block_id, block in heap.blocks.items():
+        blocks[block_id] = {field: getattr(block, field) for field in BLOCK_FIELDS}
+        blocks[block_id]['references'] = set(block.references)
+    return blocks
+
+def reconstructed(history: HeapHistory, cycle_id: int, phase: str):
+    """A recorded checkpoint in the same form as snapshot()"""
+    state = history.get_heap(cycle_id, phase)
+    if state is None:
+        return None
+    return {block['id']: {**block, 'references': set(block['references'])} for block in state['blocks']}
+
+def run_cycles(history: HeapHistory, seed: int, cycles: int):
+    """Record seeded workload/collection cycles, returning the true heap around each one"""
+    heap = history.heap
+    random.seed(seed)
+    gc = GenerationalGC(heap)
+    workload = WorkloadGenerator(heap)
+    expected = {}
+    for cycle_id in range(1, cycles + 1):
+        workload.run(random.choice(['random', 'circular', 'long-lived', 'short-lived']), count=15)
+        history.capture_before()
+        expected[(cycle_id, 'before')] = snapshot(heap)
+        gc.collect(minor_only=cycle_id % 3 != 0)
+        history.capture_after(cycle_id)
+        expected[(cycle_id, 'after')] = snapshot(heap)
+    return expected
+
+@pytest.mark.parametrize('keyframe_interval', [1, 3, 16])
+def test_reconstruction_without_eviction(keyframe_interval):
+    heap = HeapSimulator(total_size=1 << 16, block_size=16)
+    history = HeapHistory(heap, keyframe_interval=keyframe_interval)
+    expected = run_cycles(history, seed=keyframe_interval, cycles=20)
+    assert history.evicted_checkpoints == 0
+    for (cycle_id, phase), blocks in expected.items():
+        assert reconstructed(history, cycle_id, phase) == blocks
+
+@pytest.mark.parametrize('keyframe_interval', [1, 3, 16])
+def test_reconstruction_across_keyframe_eviction(keyframe_interval):
+    heap = HeapSimulator(total_size=1 << 16, block_size=16)
+    history = HeapHistory(heap, keyframe_interval=keyframe_interval, memory_budget=1_500_000)
+    expected = run_cycles(history, seed=keyframe_interval, cycles=40)
+    stats = history.get_stats()
+    assert stats['evicted_checkpoints'] > 0
+    assert stats['estimated_bytes'] <= history.memory_budget or stats['checkpoints'] == 1
+    # Whatever is left starts at a keyframe and reconstructs exactly; evicted cycles are reported missing
+    assert 'keyframe' in history.checkpoints[0]
+    recorded = set(stats['cycles'])
+    assert len(recorded) > 1 and 40 in recorded
+    for (cycle_id, phase), blocks in expected.items():
+        state = reconstructed(history, cycle_id, phase)
+        if (cycle_id, phase) in history.cycles:
+            assert state == blocks
+        else:
+            assert state is None
+            assert cycle_id <= min(recorded)
+
+def test_clear_forgets_checkpoints():
+    heap = HeapSimulator(total_size=1 << 16, block_size=16)
+    history = HeapHistory(heap, keyframe_interval=4)
+    run_cycles(history, seed=0, cycles=5)
+    heap.history = history
+    heap.reset()
+    assert history.get_stats()['checkpoints'] == 0
+    assert history.get_heap(1) is None
@@ -0,0 +1,118 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from gc_engine.memory import HeapSimulator
+from gc_engine.mark_sweep import MarkSweepGC
+
+def lazy_heap(objects: int = 40, seed: int = 0):
+    """Heap with a random graph and a lazy mark-sweep cycle left unswept"""
+    rng = random.Random(seed)
+    heap = HeapSimulator(total_size=objects * 2 * 16, block_size=16)
+    ids = [heap.allocate(1, root=rng.random() < 0.2) for _ in range(objects)]
+    for _ in range(objects):
+        heap.add_reference(rng.choice(ids), rng.choice(ids))
+    gc = MarkSweepGC(heap, lazy=True, sweep_chunk=4)
+    return heap, gc
+
+def live_ids(heap: HeapSimulator):
+    """Objects reachable from the roots"""
+    live = set()
+    stack = list(heap.roots)
+    while stack:
+        block_id = stack.pop()
+        if block_id not in live:
+            live.add(block_id)
+            stack.extend(heap.blocks[block_id].references)
+    return live
+
+def test_reference_added_during_lazy_sweep_keeps_target_alive_through_api():
+    client = TestClient(server.app)
+    client.post('/api/heap/init', json={'total_size': 1024, 'block_size': 16})
+    root = client.post('/api/heap/allocate', json={'size': 1, 'root': True}).json()['block_id']
+    target = client.post('/api/heap/allocate', json={'size': 1, 'root': False}).json()['block_id']
+    client.post('/api/gc/collect', json={'algorithm': 'mark-sweep', 'lazy_sweep': True})
+    client.post('/api/heap/reference', json={'from_id': root, 'to_id': target})
+    
+    assert target not in client.get('/api/heap/garbage').json()['block_ids']
+    client.post('/api/heap/allocate', json={'size': 1, 'root': False})
+    client.post('/api/gc/sweep', json={})
+    blocks = {block['id']: block for block in client.get('/api/heap/state').json()['blocks']}
+    assert target in blocks
+    assert blocks[root]['references'] == [target]
+
+def test_barrier_follows_new_objects_and_ignores_garbage_sources():
+    heap = HeapSimulator(total_size=1024, block_size=16)
+    root = heap.allocate(1, root=True)
+    dead = heap.allocate(1)
+    chain = [heap.allocate(1) for _ in range(3)]
+    heap.add_reference(chain[0], chain[1])
+    heap.add_reference(chain[1], chain[2])
+    gc = MarkSweepGC(heap, lazy=True, sweep_chunk=1)
+    gc.collect()
+    
+    # A reference from garbage keeps nothing alive
+    heap.add_reference(dead, chain[0])
+    assert not heap.blocks[chain[0]].marked
+    # A live object reached through an object allocated after the mark keeps the whole chain alive
+    fresh = heap.allocate(1)
+    heap.add_reference(root, fresh)
+    heap.add_reference(fresh, chain[0])
+    heap.finish_pending_sweep()
+    assert set(heap.blocks) == {root, fresh, *chain}
+
+@pytest.mark.parametrize('seed', range(10))
+def test_lazy_sweep_frees_exactly_what_an_eager_sweep_would(seed):
+    heap, gc = lazy_heap(seed=seed)
+    eager_heap = heap.clone()
+    eager = MarkSweepGC(eager_heap).collect()
+    
+    metrics = gc.collect()
+    assert metrics['sweep_mode'] == 'lazy'
+    assert metrics['objects_freed'] == 0
+    assert metrics['objects_pending_sweep'] == eager['objects_freed']
+    assert metrics['regions_pending_sweep'] == len(gc.pending_regions) == -(-len(heap.blocks) // 4)
+    
+    gc.finish_sweep()
+    assert heap.sweeper is None
+    assert metrics['objects_freed'] == eager['objects_freed']
+    assert metrics['bytes_reclaimed'] == eager['bytes_reclaimed']
+    assert metrics['objects_pending_sweep'] == 0
+    assert metrics['regions_pending_sweep'] == 0
+    assert set(heap.blocks) == set(eager_heap.blocks)
+    assert not any(block.marked for block in heap.blocks.values())
+
+def test_allocation_sweeps_one_region_unless_it_needs_more_space():
+    heap, gc = lazy_heap(objects=40, seed=1)
+    metrics = gc.collect()
+    regions = len(gc.pending_regions)
+    
+    heap.allocate(1)
+    assert len(gc.pending_regions) == regions - 1
+    assert metrics['sweep_allocations'] == 1
+    assert metrics['amortized_sweep_cost'] == round(metrics['allocation_sweep_time'], 4)
+    
+    # A region frees at most four blocks, so this request needs several regions swept first
+    assert heap.allocate(heap.free_blocks + 5) is not None
+    assert metrics['sweep_allocations'] == 2
+    assert len(gc.pending_regions) < regions - 2
+    assert metrics['amortized_sweep_cost'] == round(metrics['allocation_sweep_time'] / 2, 4)
+    
+    # Explicit sweeps are not charged to allocations
+    allocation_time = metrics['allocation_sweep_time']
+    gc.finish_sweep()
+    assert metrics['allocation_sweep_time'] == allocation_time
+    assert metrics['sweep_allocations'] == 2
+
+def test_barrier_keeps_pending_count_in_step():
+    heap, gc = lazy_heap(seed=3)
+    metrics = gc.collect()
+    garbage = [block_id for block_id in heap.blocks if block_id not in live_ids(heap)]
+    root = next(iter(heap.roots))
+    heap.add_reference(root, garbage[0])
+    assert metrics['objects_pending_sweep'] == len(heap.blocks) - len(live_ids(heap))
+    gc.finish_sweep()
+    assert metrics['objects_pending_sweep'] == 0
+    assert set(heap.blocks) == live_ids(heap)
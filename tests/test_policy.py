@@ -0,0 +1,103 @@
+import random
+
+from gc_engine.memory import HeapSimulator
+from gc_engine.mark_sweep import MarkSweepGC
+from gc_engine.generational import GenerationalGC
+from gc_engine.metrics import MetricsTracker
+from gc_engine.policy import GCPolicy
+from gc_engine.workload import WorkloadGenerator
+
+def make_policy(gc_class=MarkSweepGC, total_size: int = 1024, **options):
+    """Heap of 16-byte blocks with a policy attached to a fresh collector"""
+    heap = HeapSimulator(total_size=total_size, block_size=16)
+    gc = gc_class(heap)
+    policy = GCPolicy(heap, gc, MetricsTracker(), **options)
+    policy.attach()
+    return heap, gc, policy
+
+def test_collections_wait_for_the_batch_to_end():
+    heap, gc, policy = make_policy(max_total_size=1024)
+    with heap.allocation_batch():
+        ids = [heap.allocate(1) for _ in range(60)]
+        # Past the occupancy threshold, but the objects are not linked yet
+        assert policy.collections_triggered == 0
+        assert all(block_id in heap.blocks for block_id in ids)
+    # The deferred collection runs as the batch closes
+    assert policy.collections_triggered == 1
+    assert heap.allocated_blocks == 0
+
+def test_full_heap_grows_instead_of_collecting_inside_a_batch():
+    heap, gc, policy = make_policy(max_total_size=4096)
+    with heap.allocation_batch():
+        ids = [heap.allocate(1) for _ in range(100)]
+        assert None not in ids
+        assert policy.collections_triggered == 0
+        assert heap.num_blocks > 64
+
+def test_workload_objects_survive_policy_collections():
+    random.seed(0)
+    heap, gc, policy = make_policy(max_total_size=1024)
+    result = WorkloadGenerator(heap).run('random', count=30, root_prob=0.3, ref_density=0.3)
+    assert all(block_id in heap.blocks for block_id in result['allocated'])
+
+def test_backoff_doubles_while_the_heap_stays_full_and_resets_after():
+    heap, gc, policy = make_policy(max_total_size=1024)
+    backoffs = []
+    for _ in range(300):
+        before = policy.collections_triggered
+        heap.allocate(1, root=True)
+        if policy.collections_triggered != before:
+            backoffs.append(policy.backoff_blocks)
+    # The first cycle still gets under the threshold; every later one finds only live objects
+    assert backoffs[0] == 0
+    assert backoffs[1] == heap.num_blocks // 16
+    assert all(b == min(2 * a, heap.num_blocks) for a, b in zip(backoffs[1:], backoffs[2:]))
+    assert backoffs[-1] == heap.num_blocks
+    assert policy.collections_triggered < 12
+    
+    # Once a cycle brings occupancy back under the threshold, collections are no longer held off
+    for block_id in list(heap.roots):
+        heap.roots.discard(block_id)
+        heap.blocks[block_id].root = False
+    for _ in range(heap.num_blocks):
+        heap.allocate(1)
+        if policy.backoff_blocks == 0:
+            break
+    assert policy.backoff_blocks == 0
+    assert policy.occupancy() <= policy.occupancy_threshold
+
+def test_minor_collection_escalates_when_it_frees_too_little():
+    heap, gc, policy = make_policy(GenerationalGC, max_total_size=1024, adaptive=False)
+    policy.detach()  # Set the heap up without the policy collecting along the way
+    gc.promotion_age = 1
+    holder = heap.allocate(1, root=True)
+    tenured = [heap.allocate(2) for _ in range(10)]
+    for block_id in tenured:
+        heap.add_reference(holder, block_id)
+    gc.collect(minor_only=True)
+    assert all(heap.blocks[block_id].generation == 1 for block_id in tenured)
+    # The old objects become garbage that only a major collection can reclaim
+    heap.blocks[holder].references.clear()
+    while heap.free_blocks:
+        heap.allocate(1, root=True)
+    
+    policy.attach()
+    metrics = policy.collect('allocation-failure', requested=10)
+    assert metrics['collection_type'] == 'Major (Full)'
+    assert metrics['objects_freed'] == len(tenured)
+    assert heap.free_blocks >= 10
+    reasons = [decision['reason'] for decision in policy.metrics.get_policy_decisions()]
+    assert 'minor-insufficient' in reasons
+
+def test_heap_growth_is_bounded_by_max_total_size():
+    heap, gc, policy = make_policy(max_total_size=2048, growth_factor=10)
+    assert policy._grow_heap(0, 'test')
+    assert heap.total_size == 2048
+    assert not policy._grow_heap(100, 'test')
+    assert heap.total_size == 2048
+    
+    # Failed allocations of live objects stop growing the heap at the bound
+    for _ in range(200):
+        heap.allocate(1, root=True)
+    assert heap.total_size == 2048
+    assert heap.allocated_blocks == heap.num_blocks
@@ -0,0 +1,83 @@
+import random
+
+import pytest
+from fastapi.testclient import TestClient
+
+import server
+from gc_engine.memory import HeapSimulator
+from gc_engine.reachability import ReachabilityIndex
+
+def reachable(heap: HeapSimulator):
+    """Live set by a full traversal from the roots"""
+    live = set()
+    stack = list(heap.roots)
+    while stack:
+        block_id = stack.pop()
+        if block_id in live:
+            continue
+        live.add(block_id)
+        stack.extend(ref for ref in heap.blocks[block_id].references if ref in heap.blocks)
+    return live
+
+def mutate(heap: HeapSimulator, rng: random.Random):
+    """Apply one random allocation, reference change or deallocation"""
+    ids = list(heap.blocks)
+    action = rng.random()
+    if len(ids) < 2 or action < 0.25:
+        heap.allocate(1, root=rng.random() < 0.2)
+    elif action < 0.6:
+        heap.add_reference(rng.choice(ids), rng.choice(ids))
+    elif action < 0.85:
+        block = heap.blocks[rng.choice(ids)]
+        if block.references:
+            heap.remove_reference(block.id, rng.choice(sorted(block.references)))
+    else:
+        heap.deallocate(rng.choice(ids))
+
+@pytest.mark.parametrize('seed', range(20))
+def test_incremental_updates_match_full_traversal(seed):
+    rng = random.Random(seed)
+    heap = HeapSimulator(total_size=1 << 16, block_size=16)
+    index = ReachabilityIndex(heap)
+    index.attach()
+    for _ in range(400):
+        mutate(heap, rng)
+        # Compare the maintained sets directly so a rebuild cannot hide a wrong update
+        assert not index.dirty
+        live = reachable(heap)
+        assert index.live == live
+        assert index.unreachable == set(heap.blocks) - live
+    assert index.stats['full_rebuilds'] == 1
+    assert index.stats['incremental_updates'] > 0
+
+@pytest.mark.parametrize('seed', range(10))
+def test_recheck_overflow_falls_back_to_rebuild(seed):
+    rng = random.Random(seed)
+    heap = HeapSimulator(total_size=1 << 16, block_size=16)
+    index = ReachabilityIndex(heap, max_recheck=2)
+    index.attach()
+    for _ in range(300):
+        mutate(heap, rng)
+        live = reachable(heap)
+        assert index.live_set() == live
+        assert index.garbage_set() == set(heap.blocks) - live
+
+def test_index_is_kept_across_heap_init():
+    client = TestClient(server.app)
+    client.post('/api/heap/reachability', json={'enabled': True, 'max_recheck': 7})
+    try:
+        client.post('/api/heap/init', json={'total_size': 2048, 'block_size': 16})
+        assert server.heap.reachability is not None
+        assert server.heap.reachability.heap is server.heap
+        assert server.heap.reachability.max_recheck == 7
+        
+        root = client.post('/api/heap/allocate', json={'size': 1, 'root': True}).json()['block_id']
+        orphan = client.post('/api/heap/allocate', json={'size': 1, 'root': False}).json()['block_id']
+        garbage = client.get('/api/heap/garbage').json()
+        assert garbage['block_ids'] == [orphan]
+        assert garbage['index']['full_rebuilds'] == 1
+        assert root in server.heap.reachability.live
+    finally:
+        client.post('/api/heap/reachability', json={'enabled': False})
+    client.post('/api/heap/init', json={'total_size': 2048, 'block_size': 16})
+    assert server.heap.reachability is None
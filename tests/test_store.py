@@ -0,0 +1,33 @@
+from fastapi.testclient import TestClient
+
+import server
+from gc_engine.store import HeapStore
+
+def test_only_state_changing_requests_republish(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'heap_store', HeapStore(str(tmp_path / 'heap.state')))
+    client = TestClient(server.app)
+    client.post('/api/heap/init', json={'total_size': 1024, 'block_size': 16})
+    client.post('/api/heap/allocate', json={'size': 1, 'root': True})
+    generation = server.heap_store.generation
+    assert generation > 0
+    
+    assert client.post('/api/analytics/locality', json={'algorithms': ['mark-sweep']}).status_code == 200
+    assert client.get('/api/heap/state').status_code == 200
+    assert server.heap_store.generation == generation
+    
+    client.post('/api/heap/allocate', json={'size': 1, 'root': False})
+    assert server.heap_store.generation > generation
+
+def test_failed_request_forces_a_reload(tmp_path, monkeypatch):
+    monkeypatch.setattr(server, 'heap_store', HeapStore(str(tmp_path / 'heap.state')))
+    client = TestClient(server.app, raise_server_exceptions=False)
+    client.post('/api/heap/init', json={'total_size': 1024, 'block_size': 16})
+    client.post('/api/heap/allocate', json={'size': 1, 'root': True})
+    
+    def fail_halfway(*args, **kwargs):
+        server.heap.allocate(1, root=True)
+        raise RuntimeError("collector bug")
+    monkeypatch.setattr(server.workload_gen, 'run', fail_halfway)
+    assert client.post('/api/workload/generate', json={'type': 'random'}).status_code == 500
+    # The half-finished allocation was never published, so the next request discards it
+    assert len(client.get('/api/heap/state').json()['blocks']) == 1